@@ -0,0 +1,351 @@
+'''
+    Purpose:
+        Command line interface to the RAID pool tools, for use without editing the
+        raid_* scripts.
+
+    Usage:
+        python3 -m com.heresjono evaluate --catalog disks.json --mirror WD4TB,WD8TB --mirror WD8TB,WD8TB
+        python3 -m com.heresjono optimize --catalog disks.json --min-capacity 6e12 --max-cost 1500
+        python3 -m com.heresjono arrange --catalog disks.json --count WD4TB=7 --count WD8TB=6
+        python3 -m com.heresjono upgrade --catalog fleet.json --pool nas-01 --min-capacity 20e12
+        python3 -m com.heresjono fleet fleet.json --output fleet_metrics.csv
+
+    Catalogs are JSON files in the fleet inventory format (see fleet.py): a list of
+    "disks" and, optionally, named "pools". Disks can also be given on the command line,
+    e.g. --disk WD8TB:capacity=8e12,afr=0.06,cost=305. Constraints can be read from a JSON
+    file with --constraints, keyed like the long options (e.g. "max_cost"); options given
+    on the command line take precedence.
+
+    Each command imports only the modules it needs, so that evaluating a single pool
+    from shell automation stays fast.
+'''
+
+import argparse
+import json
+import locale
+
+DEFAULTS = {                        # Same defaults as the raid_* scripts.
+    'mission_length': 3,            # How long to keep things running in years.
+    'max_failure': 1 / 10000,       # Chance of losing pool during mission.
+    'min_capacity': 6e12,           # Minimum capacity in bytes.
+    'max_cost': 1500,               # Maximum to spend on disks.
+    'min_read': 0,                  # Minimum read throughput in bytes per second.
+    'min_write': 0,                 # Minimum write throughput in bytes per second.
+}
+
+POOL_METRICS = (                    # DiskArray properties reported by evaluate --json.
+    'capacity',
+    'cost',
+    'annual_cost',
+    'tco',
+    'read_throughput',
+    'write_throughput',
+    'annual_failure',
+    'mission_loss',
+    )
+
+
+def _parse_disk(
+        text:str        # E.g., "WD8TB:capacity=8e12,afr=0.06,cost=305,type=HDD".
+        ):
+    '''Return disk spec parsed from a --disk option.'''
+    name, _, params = text.partition(':')
+    spec = {'name': name}
+    for param in params.split(','):
+        key, sep, value = param.partition('=')
+        if not name or not sep:
+            raise argparse.ArgumentTypeError('expected NAME:key=value,... but got %r' % text)
+        try:
+            spec[key] = value if key == 'type' else float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError('%s of %s is not a number' % (key, name))
+    return spec
+
+
+def _parse_count(
+        text:str        # E.g., "WD8TB=6".
+        ):
+    '''Return (disk name, count) parsed from a --count option.'''
+    name, sep, count = text.rpartition('=')
+    if not sep or not count.isdigit():
+        raise argparse.ArgumentTypeError('expected NAME=COUNT but got %r' % text)
+    return name, int(count)
+
+
+def _load_catalog(args):
+    '''Return (dict of disk name -> Disk, dict of pool name -> layout) from the catalog
+       file and --disk options.'''
+    import com.heresjono.raidcalc as raidcalc
+
+    specs = {}
+    pools = {}
+    if args.catalog:
+        with open(args.catalog) as f:
+            catalog = json.load(f)
+        if not isinstance(catalog, dict) or not isinstance(catalog.get('disks', []), list) or \
+                not isinstance(catalog.get('pools', {}), dict):
+            raise ValueError('Catalog %s must be a JSON object with a list of "disks" and an '
+                    'object of "pools".' % args.catalog)
+        for spec in catalog.get('disks', []):
+            if not isinstance(spec, dict) or not isinstance(spec.get('name'), str):
+                raise ValueError('Every disk in %s needs a "name"; got %r.' % (args.catalog, spec))
+            specs[spec['name']] = spec
+        pools.update(catalog.get('pools', {}))
+    specs.update({spec['name']: spec for spec in args.disk})
+
+    # One Disk per name, so disks of the same model are grouped by the search.
+    disks = {}
+    for name, spec in specs.items():
+        try:
+            disks[name] = raidcalc.disk_from_spec(spec)
+        except TypeError as e:
+            raise ValueError('Bad disk %r: %s.' % (name, e))
+    return disks, pools
+
+
+def _load_constraints(args):
+    '''Return dict of DEFAULTS overridden by the constraints file, then by options.'''
+    constraints = dict(DEFAULTS)
+    if args.constraints:
+        with open(args.constraints) as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError('Constraints in %s must be a JSON object.' % args.constraints)
+        for key, value in loaded.items():
+            if key not in DEFAULTS:
+                raise ValueError('Unknown constraint %r in %s.' % (key, args.constraints))
+            try:
+                constraints[key] = float(value)
+            except (TypeError, ValueError):
+                raise ValueError('Constraint %s in %s is not a number: %r.' % (key, args.constraints, value))
+
+    for key in DEFAULTS:
+        if getattr(args, key, None) is not None:
+            constraints[key] = getattr(args, key)
+
+    if constraints['mission_length'] <= 0:
+        raise ValueError('Mission length must be positive; got %r.' % constraints['mission_length'])
+    if not 0 <= constraints['max_failure'] <= 1:
+        raise ValueError('Maximum failure must be between 0 and 1; got %r.' % constraints['max_failure'])
+
+    import com.heresjono.raidcalc as raidcalc
+    raidcalc.MISSION_LENGTH = constraints['mission_length']
+    constraints['max_afr'] = 1 - ((1 - constraints['max_failure']) ** (1 / constraints['mission_length']))
+    return constraints
+
+
+def _lookup(
+        disks:dict,     # Disk name -> Disk.
+        name:str
+        ):
+    '''Return the Disk called name.'''
+    if not isinstance(name, str) or name not in disks:
+        raise ValueError('Unknown disk %r; add it to the catalog or with --disk.' % name)
+    return disks[name]
+
+
+def _load_pool(args, disks:dict, pools:dict):
+    '''Return the DiskArray given by --pool or --mirror.'''
+    import com.heresjono.raidcalc as raidcalc
+
+    if args.pool:
+        if args.pool not in pools:
+            raise ValueError('Unknown pool %r.' % args.pool)
+        layout = pools[args.pool]
+        if not isinstance(layout, list) or not layout or \
+                not all([isinstance(mirror, list) and mirror for mirror in layout]):
+            raise ValueError('Pool %s must be a non-empty list of mirrors of disk names.' % args.pool)
+    elif args.mirror:
+        layout = [mirror.split(',') for mirror in args.mirror]
+    else:
+        raise ValueError('Give a pool with --pool or --mirror.')
+
+    return raidcalc.DiskArray([raidcalc.Mirror([_lookup(disks, name) for name in mirror])
+        for mirror in layout])
+
+
+def _set_locale():
+    '''Use the user's locale for currency and number formatting.'''
+    locale.setlocale(locale.LC_ALL, '')
+
+
+def evaluate(args):
+    '''Print information about one pool.'''
+    disks, pools = _load_catalog(args)
+    _load_constraints(args)
+    pool = _load_pool(args, disks, pools)
+
+    if args.json:
+        print(json.dumps({metric: getattr(pool, metric) for metric in POOL_METRICS}))
+    else:
+        from com.heresjono.raidcalc import print_pool_info
+        _set_locale()
+        print_pool_info(pool)
+
+
+def _report_configs(args, configs:list):
+    '''Save configs if --store was given, then print notable ones.'''
+    if args.store:
+        from com.heresjono.resultstore import save_results
+        save_results(args.store, configs)
+
+    from com.heresjono.raidcalc import print_notable_configs
+    _set_locale()
+    print_notable_configs(configs)
+
+
+def optimize(args):
+    '''Search for pools built from catalog disks that satisfy constraints.'''
+    disks, _ = _load_catalog(args)
+    constraints = _load_constraints(args)
+    options = [_lookup(disks, name) for name in args.choose] if args.choose else list(disks.values())
+
+    from com.heresjono.raidcalc import generate_disk_configurations
+    configs = generate_disk_configurations(
+            options,
+            min_capacity=constraints['min_capacity'],
+            min_read_throughput=constraints['min_read'],
+            min_write_throughput=constraints['min_write'],
+            max_afr=constraints['max_afr'],
+            max_cost=constraints['max_cost'])
+    _report_configs(args, configs)
+
+
+def arrange(args):
+    '''Search for arrangements of a fixed set of disks that satisfy constraints.'''
+    disks, _ = _load_catalog(args)
+    constraints = _load_constraints(args)
+    if not args.count:
+        raise ValueError('Give the disks to arrange with --count.')
+
+    arrangement = []
+    for name, count in args.count:
+        arrangement.extend([_lookup(disks, name)] * count)
+
+    from com.heresjono.raidcalc import generate_disk_configurations
+    configs = generate_disk_configurations(
+            None,
+            disks=[arrangement],
+            min_capacity=constraints['min_capacity'],
+            min_read_throughput=constraints['min_read'],
+            min_write_throughput=constraints['min_write'],
+            max_afr=constraints['max_afr'],
+            max_cost=1e10,
+            mixed_mirrors=args.mixed,
+            max_mirror_width=args.max_mirror_width)
+    _report_configs(args, configs)
+
+
+def upgrade(args):
+    '''Search for upgrades of an existing pool that satisfy constraints.'''
+    disks, pools = _load_catalog(args)
+    constraints = _load_constraints(args)
+    pool = _load_pool(args, disks, pools)
+    options = [_lookup(disks, name) for name in args.choose] if args.choose else list(disks.values())
+
+    from com.heresjono.raidcalc import generate_upgrades, print_notable_upgrades
+    upgrades = generate_upgrades(
+            pool,
+            options,
+            min_capacity=constraints['min_capacity'],
+            min_read_throughput=constraints['min_read'],
+            min_write_throughput=constraints['min_write'],
+            max_afr=constraints['max_afr'],
+            max_cost=constraints['max_cost'],
+            max_width=args.max_width)
+    _set_locale()
+    print_notable_upgrades(upgrades)
+
+
+def fleet(args):
+    '''Evaluate every pool of a fleet inventory.'''
+    _load_constraints(args)
+
+    from com.heresjono.fleet import load_inventory, evaluate_fleet, write_metrics, print_fleet_info
+    specs, pools = load_inventory(args.inventory)
+    rows = evaluate_fleet(specs, pools, args.processes)
+    if args.output:
+        write_metrics(args.output, rows)
+    _set_locale()
+    print_fleet_info(rows)
+
+
+def _make_parser():
+    '''Return the argument parser.'''
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--mission-length', type=float, dest='mission_length',
+            help='years to keep the pool running (default %(mission_length)s)' % DEFAULTS)
+    common.add_argument('--constraints', metavar='FILE', help='JSON file of constraints')
+
+    catalog = argparse.ArgumentParser(add_help=False)
+    catalog.add_argument('--catalog', metavar='FILE', help='JSON file of disks and pools')
+    catalog.add_argument('--disk', metavar='SPEC', type=_parse_disk, action='append', default=[],
+            help='add a disk, e.g. WD8TB:capacity=8e12,afr=0.06,cost=305')
+
+    search = argparse.ArgumentParser(add_help=False)
+    search.add_argument('--max-failure', type=float, dest='max_failure',
+            help='chance of losing the pool during the mission (default %(max_failure)s)' % DEFAULTS)
+    search.add_argument('--min-capacity', type=float, dest='min_capacity',
+            help='minimum capacity in bytes (default %(min_capacity)s)' % DEFAULTS)
+    search.add_argument('--max-cost', type=float, dest='max_cost',
+            help='maximum to spend on disks (default %(max_cost)s)' % DEFAULTS)
+    search.add_argument('--min-read', type=float, dest='min_read',
+            help='minimum read throughput in bytes per second')
+    search.add_argument('--min-write', type=float, dest='min_write',
+            help='minimum write throughput in bytes per second')
+
+    pool = argparse.ArgumentParser(add_help=False)
+    pool.add_argument('--pool', help='name of a pool in the catalog')
+    pool.add_argument('--mirror', metavar='DISK,DISK', action='append',
+            help='add a mirror of the named disks to the pool')
+
+    store = argparse.ArgumentParser(add_help=False)
+    store.add_argument('--store', metavar='DIR', help='save viable configurations to a result store')
+
+    parser = argparse.ArgumentParser(prog='python3 -m com.heresjono',
+            description='Calculate performance-cost-reliability tradeoffs of RAID pools.')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    cmd = commands.add_parser('evaluate', parents=[common, catalog, pool], help=evaluate.__doc__)
+    cmd.add_argument('--json', action='store_true', help='print metrics as JSON')
+    cmd.set_defaults(func=evaluate)
+
+    cmd = commands.add_parser('optimize', parents=[common, catalog, search, store], help=optimize.__doc__)
+    cmd.add_argument('--choose', metavar='DISK', action='append',
+            help='only consider the named disks (default: whole catalog)')
+    cmd.set_defaults(func=optimize)
+
+    cmd = commands.add_parser('arrange', parents=[common, catalog, search, store], help=arrange.__doc__)
+    cmd.add_argument('--count', metavar='DISK=N', type=_parse_count, action='append',
+            help='arrange N of the named disk')
+    cmd.add_argument('--mixed', action='store_true', help='allow mirrors of mismatched disks')
+    cmd.add_argument('--max-mirror-width', type=int, help='most disks in a mixed mirror')
+    cmd.set_defaults(func=arrange)
+
+    cmd = commands.add_parser('upgrade', parents=[common, catalog, search, pool], help=upgrade.__doc__)
+    cmd.add_argument('--choose', metavar='DISK', action='append',
+            help='only buy the named disks (default: whole catalog)')
+    cmd.add_argument('--max-width', type=int, default=3, help='most disks in a widened mirror')
+    cmd.set_defaults(func=upgrade)
+
+    cmd = commands.add_parser('fleet', parents=[common], help=fleet.__doc__)
+    cmd.add_argument('inventory', help='JSON fleet inventory')
+    cmd.add_argument('--output', metavar='FILE', help='write per-pool metrics as CSV')
+    cmd.add_argument('--processes', type=int, help='worker processes (default: one per CPU)')
+    cmd.set_defaults(func=fleet)
+
+    return parser
+
+
+def main(argv:list=None):
+    parser = _make_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+'''
+    Purpose:
+        Evaluate a fleet of existing pools in bulk and summarize the fleet as a whole.
+
+    An inventory is a JSON file describing the disk models in use and the layout of every
+    pool as a list of mirrors, each a list of disk model names:
+
+        {
+            "disks": [
+                {"type": "HDD", "name": "WD8TB", "capacity": 8e12, "afr": 0.06, "cost": 305},
+                {"type": "SSD", "name": "WD Blue 3D 1TB", "capacity": 1e12, "cost": 190}
+            ],
+            "pools": {
+                "nas-01": [["WD8TB", "WD8TB"], ["WD8TB", "WD8TB"]],
+                "nas-02": [["WD Blue 3D 1TB", "WD Blue 3D 1TB"]]
+            }
+        }
+
+    Disk entries take the same parameters as HDD/SSD; "type" defaults to HDD. Pools with
+    the same layout, regardless of mirror or member order, are evaluated once. Unique
+    layouts are evaluated in batches spread over worker processes.
+'''
+
+import csv
+import json
+import locale
+
+import com.heresjono.raidcalc as raidcalc
+
+METRICS = (                         # Columns of the metrics table after the pool name.
+    'capacity',
+    'cost',
+    'annual_cost',
+    'tco',
+    'read_throughput',
+    'write_throughput',
+    'annual_replacements',
+    'annual_failure',
+    'mission_loss',
+    )
+
+BATCH_SIZE = 256                    # Unique layouts evaluated per worker task.
+
+_worker_disks = None                # Disk model name -> Disk, in worker processes.
+
+
+def load_inventory(
+        path:str        # Inventory JSON file.
+        ):
+    '''Return (disk specs, pools) from the inventory at path, where pools maps pool name
+       to a list of mirrors of disk model names.'''
+    with open(path) as f:
+        inventory = json.load(f)
+    if not isinstance(inventory, dict) or not isinstance(inventory.get('disks'), list) or \
+            not isinstance(inventory.get('pools'), dict):
+        raise ValueError('Inventory %s must be a JSON object with a list of "disks" and an '
+                'object of "pools".' % path)
+
+    specs = {}
+    for spec in inventory['disks']:
+        if not isinstance(spec, dict) or not isinstance(spec.get('name'), str):
+            raise ValueError('Every disk in %s needs a "name"; got %r.' % (path, spec))
+        try:
+            raidcalc.disk_from_spec(spec)
+        except TypeError as e:
+            raise ValueError('Bad disk %r: %s.' % (spec['name'], e))
+        specs[spec['name']] = spec
+
+    for name, pool in inventory['pools'].items():
+        if not isinstance(pool, list) or not all([isinstance(mirror, list) for mirror in pool]):
+            raise ValueError('Pool %s must be a list of mirrors of disk names.' % name)
+        if not pool:
+            raise ValueError('Pool %s has no mirrors.' % name)
+        for mirror in pool:
+            if not mirror:
+                raise ValueError('Pool %s has an empty mirror.' % name)
+            for disk in mirror:
+                if not isinstance(disk, str) or disk not in specs:
+                    raise ValueError('Pool %s uses unknown disk %r.' % (name, disk))
+
+    return specs, inventory['pools']
+
+
+def layout_key(
+        pool:list       # List of mirrors of disk model names.
+        ):
+    '''Return a key that is the same for all orderings of pool's mirrors and members.'''
+    return tuple(sorted([tuple(sorted(mirror)) for mirror in pool]))
+
+
+def _make_disks(
+        specs:dict      # Disk model name -> disk parameters.
+        ):
+    '''Return dict of disk model name -> Disk.'''
+    return {name: raidcalc.disk_from_spec(spec) for name, spec in specs.items()}
+
+
+def _init_worker(
+        specs:dict,             # Disk model name -> disk parameters.
+        mission_length:float    # MISSION_LENGTH of the parent process.
+        ):
+    '''Set up a worker process.'''
+    global _worker_disks
+    raidcalc.MISSION_LENGTH = mission_length
+    _worker_disks = _make_disks(specs)
+
+
+def _evaluate_batch(
+        keys:list       # Layout keys to evaluate.
+        ):
+    '''Return tuple of METRICS for each layout in keys.'''
+    mirrors = {}        # Identical mirrors recur across layouts; build each once.
+    results = []
+    for key in keys:
+        for mirror in key:
+            if mirror not in mirrors:
+                mirrors[mirror] = raidcalc.Mirror([_worker_disks[disk] for disk in mirror])
+        ary = raidcalc.DiskArray([mirrors[mirror] for mirror in key])
+        results.append((
+            ary.capacity,
+            ary.cost,
+            ary.annual_cost,
+            ary.tco,
+            ary.read_throughput,
+            ary.write_throughput,
+            sum([mirror.rebuilds_per_year for mirror in ary.devices]),
+            ary.annual_failure,
+            ary.mission_loss,
+            ))
+    return results
+
+
+def evaluate_fleet(
+        specs:dict,             # Disk model name -> disk parameters.
+        pools:dict,             # Pool name -> list of mirrors of disk model names.
+        processes:int=None      # Worker processes; all CPUs by default, 1 to stay in-process.
+        ):
+    '''Return list of (pool name, metrics) in inventory order, where metrics is a dict of
+       METRICS.'''
+    keys = {name: layout_key(pool) for name, pool in pools.items()}
+    unique = sorted(set(keys.values()))
+    batches = [unique[i:i + BATCH_SIZE] for i in range(0, len(unique), BATCH_SIZE)]
+    mission_length = raidcalc.MISSION_LENGTH
+
+    if processes == 1 or len(batches) <= 1:
+        _init_worker(specs, mission_length)
+        results = [_evaluate_batch(batch) for batch in batches]
+    else:
+        import multiprocessing      # Only needed, and only worth starting, for big fleets.
+        with multiprocessing.Pool(processes, _init_worker, (specs, mission_length)) as pool:
+            results = pool.map(_evaluate_batch, batches)
+
+    cache = {}
+    for batch, batch_results in zip(batches, results):
+        for key, values in zip(batch, batch_results):
+            cache[key] = dict(zip(METRICS, values))
+
+    return [(name, cache[key]) for name, key in keys.items()]
+
+
+def write_metrics(
+        path:str,       # CSV file to write.
+        rows:list       # (pool name, metrics) as returned by evaluate_fleet.
+        ):
+    '''Write a metrics table with one row per pool.'''
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('pool',) + METRICS)
+        for name, metrics in rows:
+            writer.writerow([name] + [metrics[metric] for metric in METRICS])
+
+
+def print_fleet_info(
+        rows:list       # (pool name, metrics) as returned by evaluate_fleet.
+        ):
+    '''Pretty-print fleet-wide totals and expectations.'''
+
+    def total(metric):
+        return sum([metrics[metric] for _, metrics in rows])
+
+    print('===  Fleet  ===')
+    print('Pools                                        {:n}'.format(len(rows)))
+    print('Capacity (GB)                                {:n}'.format(total('capacity') / 1e9))
+    print()
+    print('Cost                                         ' + locale.currency(total('cost'), grouping=True))
+    print('Annual replacement costs                     ' + locale.currency(total('annual_cost'), grouping=True))
+    print('Total cost of ownership                      ' + locale.currency(total('tco'), grouping=True))
+    print()
+    print('Expected disk replacements/year              {:n}'.format(total('annual_replacements')))
+    print('Expected pool losses/year                    {:n}'.format(total('annual_failure')))
+    print('Expected pool losses during mission          {:n}'.format(total('mission_loss')))
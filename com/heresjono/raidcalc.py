@@ -219,6 +219,20 @@ class SSD(Disk):
         super().__init__(name, capacity, speed, afr, cost, replacement_time)
 
 
+DISK_TYPES = {'Disk': Disk, 'HDD': HDD, 'SSD': SSD}
+
+
+def disk_from_spec(
+        spec:dict       # Disk parameters, plus "type" of Disk, HDD (default) or SSD.
+        ):
+    '''Return the Disk described by spec, e.g. as read from a JSON catalog.'''
+    spec = dict(spec)
+    disk_type = spec.pop('type', 'HDD')
+    if disk_type not in DISK_TYPES:
+        raise ValueError('Unknown disk type %r.' % disk_type)
+    return DISK_TYPES[disk_type](**spec)
+
+
 class DiskArray(object):
     '''Stripe of devices.'''
     def __init__(self,
@@ -227,6 +241,12 @@ class DiskArray(object):
         self._disks = disks
 
 
+    @property
+    def devices(self):
+        '''Return list of devices in the array.'''
+        return self._disks
+
+
     @property
     def cost(self):
         '''Return cost of array.'''
@@ -407,44 +427,79 @@ class Mirror(DiskArray):
 
 def _generate_disk_selections(
         options:list,               # List of Disks that can be used.
-        chosen:list,                # List of Disks chosen for combination.
-        results:list,               # Accumulator.
         min_capacity:int,           # Minimum capacity disks need to provide in bytes.
-        max_cost:float,             # Maximum cost for all Disks in currency of choice.
-        running_cost:float=0,       # Cost of chosen Disks in currency of choice.
-        running_capacity:int=0      # Capacity provided by chosen Disks.
+        max_cost:float              # Maximum cost for all Disks in currency of choice.
         ):
-    '''Helper function for finding all combinations of disks that satisfy price limit and
+    '''Helper generator for finding all combinations of disks that satisfy price limit and
        minimum capacity.
-    '''
-    if running_cost > max_cost:
-        return results
-
-    if running_capacity > min_capacity:
-        results.append(chosen)
-
-    for idx, option in enumerate(options):
-        _generate_disk_selections(options[idx:], chosen + [option], results, min_capacity,
-                max_cost, running_cost + option.cost, running_capacity + option.capacity)
-
-    return results
 
-
-def _generate_partitions(
-        item:Disk,      # Item to partition.
-        count:int,      # Number of times item needs to appear.
-        maxlen:int,     # Maximum number of times item can appear in newly generated partitions.
-        chosen:list,    # Partitions generated so far.
-        result:list     # Accumulator.
+       Combinations are walked depth-first with an explicit stack so that arbitrarily many
+       disks can be chosen. The yielded list is reused; copy it if it needs to be kept.
+    '''
+    chosen = []             # Disks chosen so far.
+    next_option = [0]       # Index of next option to try at each depth.
+    running_cost = [0]      # Cost of chosen Disks at each depth.
+    running_capacity = [0]  # Capacity of chosen Disks at each depth.
+
+    if running_capacity[-1] > min_capacity:
+        yield chosen
+
+    while next_option:
+        idx = next_option[-1]
+        if idx == len(options):
+            # Exhausted this depth; backtrack.
+            next_option.pop()
+            running_cost.pop()
+            running_capacity.pop()
+            if chosen:
+                chosen.pop()
+            continue
+
+        next_option[-1] = idx + 1
+        option = options[idx]
+        cost = running_cost[-1] + option.cost
+        if cost > max_cost:
+            continue
+
+        capacity = running_capacity[-1] + option.capacity
+        chosen.append(option)
+        if capacity > min_capacity:
+            yield chosen
+
+        # Only options from idx onwards may follow so that each combination appears once.
+        next_option.append(idx)
+        running_cost.append(cost)
+        running_capacity.append(capacity)
+
+
+def _generate_partition_sizes(
+        count:int       # Number to partition.
         ):
-    '''Partition item.'''
+    '''Generate the partitions of count as lists of non-increasing part sizes, largest
+       parts first. E.g., [3], [2, 1], [1, 1, 1].
 
-    if count == 0:
-        result.append(chosen)
-        return
-
-    for i in range(min(count, maxlen), 0, -1):
-        _generate_partitions(item, count - i, i, chosen + [[item] * i], result)
+       The yielded list is updated in place; copy it if it needs to be kept.
+    '''
+    sizes = [count] if count else []
+    while True:
+        yield sizes
+
+        # Strip trailing ones, then shrink the last part that can still be split.
+        remainder = 0
+        while sizes and sizes[-1] == 1:
+            sizes.pop()
+            remainder += 1
+        if not sizes:
+            return
+
+        size = sizes[-1] - 1
+        sizes[-1] = size
+        remainder += 1
+        while remainder > size:
+            sizes.append(size)
+            remainder -= size
+        if remainder:
+            sizes.append(remainder)
 
 
 def generate_partitions(
@@ -460,40 +515,261 @@ def generate_partitions(
         a a a
     '''
 
-    result = []
-    _generate_partitions(item, count, count, [], result)
-
-    return result
+    return [[[item] * size for size in sizes] for sizes in _generate_partition_sizes(count)]
 
 
 def _generate_disk_configurations(
-        disks:list,         # List of Disks to put into DiskArray.
-        chosen:list,        # Configuration so far of Disks.
-        configs:list,       # Accumulator of valid DiskArray configurations.
+        disks:list,         # List of Disks to put into DiskArray, grouped by model.
         min_read:int,       # Minimum read throughput in bytes per second.
         min_write:int,      # Minimum write throughput in bytes per second.
         min_capacity:int,   # Minimum capacity of results.
         max_afr:float       # Maximum annual failure rate of results.
         ):
-    '''Generate list of configurations involving disks that satisfy constraints.'''
+    '''Generate configurations involving disks that satisfy constraints.
 
-    if not disks:
-        mirrors = [Mirror(mirror[:]) for mirror in chosen]
-        ary = DiskArray(mirrors)
+       Every group of identical disks is partitioned into mirrors independently; the
+       partitions of all groups are stepped through like an odometer, last group fastest.
+    '''
+
+    groups = []
+    idx = 0
+    while idx < len(disks):
+        end = idx + 1
+        while end < len(disks) and disks[end] == disks[idx]:
+            end += 1
+        groups.append((disks[idx], end - idx))
+        idx = end
+
+    partitions = [_generate_partition_sizes(count) for _, count in groups]
+    current = [next(partition) for partition in partitions]
+    mirrors = {}            # Mirrors are never mutated, so share them between configurations.
+
+    while True:
+        devices = []
+        for (disk, _), sizes in zip(groups, current):
+            for size in sizes:
+                if (disk, size) not in mirrors:
+                    mirrors[(disk, size)] = Mirror([disk] * size)
+                devices.append(mirrors[(disk, size)])
+        ary = DiskArray(devices)
 
         if ary.capacity >= min_capacity and \
             ary.annual_failure <= max_afr and \
             ary.read_throughput >= min_read and \
             ary.write_throughput >= min_write:
-            configs.append(ary)
+            yield ary
+
+        group = len(groups) - 1
+        while group >= 0:
+            sizes = next(partitions[group], None)
+            if sizes is not None:
+                current[group] = sizes
+                break
+
+            # Roll this group over and carry into the previous one.
+            partitions[group] = _generate_partition_sizes(groups[group][1])
+            current[group] = next(partitions[group])
+            group -= 1
+
+        if group < 0:
+            return
+
+
+def _generate_blocks(
+        caps:list,      # Most disks available of each model.
+        size:int        # Number of disks to pick.
+        ):
+    '''Generate the ways of picking size disks from models with caps disks available, as
+       lists of counts per model in descending lexicographic order. E.g., caps [2, 1] and
+       size 2 give [2, 0], [1, 1].
+
+       The yielded list is updated in place; copy it if it needs to be kept.
+    '''
+    block = [0] * len(caps)
+    left = size
+    for i, cap in enumerate(caps):
+        block[i] = min(cap, left)
+        left -= block[i]
+    if left:
         return
 
-    same = count_sames(disks)
-    remainder = disks[same:]
+    while True:
+        yield block
 
-    for partition in generate_partitions(disks[0], same):
-        _generate_disk_configurations(remainder, chosen + partition, configs, min_read,
-            min_write, min_capacity, max_afr)
+        # Find the rightmost model whose disks can move one to the models after it.
+        left = room = 0
+        j = len(block) - 1
+        while j >= 0 and not (block[j] and room > left):
+            left += block[j]
+            room += caps[j]
+            j -= 1
+        if j < 0:
+            return
+
+        block[j] -= 1
+        left += 1
+        for i in range(j + 1, len(block)):
+            block[i] = min(caps[i], left)
+            left -= block[i]
+
+
+def _generate_mixed_configurations(
+        disks:list,         # List of Disks to put into DiskArray.
+        min_read:int,       # Minimum read throughput in bytes per second.
+        min_write:int,      # Minimum write throughput in bytes per second.
+        min_capacity:int,   # Minimum capacity of results.
+        max_afr:float,      # Maximum annual failure rate of results.
+        max_width:int=None  # Maximum number of disks in a mirror; None for no limit.
+        ):
+    '''Generate configurations involving disks that satisfy constraints, where mirrors may
+       mix disk models.
+
+       A mirror is a vector of how many disks of each model it holds. Every configuration
+       is built from mirrors in descending lexicographic order, so each arrangement is
+       generated once regardless of mirror or member order. The next mirror must also
+       hold a disk of the first model not yet placed; later mirrors are lexicographically
+       smaller and could never place it. Adding a mirror can only make an array less
+       reliable, so branches exceeding max_afr are abandoned early.
+
+       Candidate mirrors are counted down like an odometer over range(count + 1) per
+       model, bounded by the disks left, max_width and the previous mirror, so only
+       mirrors that fit are ever visited. Runs of mirrors narrower than any mirror that
+       meets max_afr on its own are skipped without being visited.
+    '''
+
+    counts = {}
+    for disk in disks:
+        counts[disk] = counts.get(disk, 0) + 1
+    models = list(counts)
+    remaining = [counts[model] for model in models]
+    if not models:
+        return
+
+    width = min(max_width or len(disks), len(disks))
+    first = 0                   # First model with disks left to place.
+
+    def largest_block(bound):
+        '''Return the largest mirror holding model first that fits and is not above
+           bound, or None.'''
+        block = [0] * len(models)
+        budget = width
+        tight = bound is not None and not any(bound[:first])
+        for i in range(first, len(models)):
+            n = min(remaining[i], budget)
+            if tight and n >= bound[i]:
+                n = bound[i]
+            else:
+                tight = False
+            block[i] = n
+            budget -= n
+        if not block[first]:
+            return None
+        return block if width - budget >= narrowest else next_block(block)
+
+    def next_block(block):
+        '''Step block down to the next smaller mirror that fits and holds at least
+           narrowest disks, or return None.'''
+        j = len(block) - 1
+        while True:
+            while not block[j]:
+                j -= 1
+            if j == first and block[j] == 1:
+                return None
+            block[j] -= 1
+            budget = width - sum(block[:j + 1])
+            for i in range(j + 1, len(block)):
+                block[i] = min(remaining[i], budget)
+                budget -= block[i]
+            if width - budget >= narrowest:
+                return block
+            # Every mirror starting with block[:j + 1] is narrower still.
+            if j == first:
+                return None
+            j -= 1
+
+    # Mirror metrics are computed once per block; array metrics combine them as DiskArray does.
+    mirrors = {}
+    def mirror_metrics(block):
+        key = tuple(block)
+        if key not in mirrors:
+            mirror = Mirror([model for model, n in zip(models, block) for _ in range(n)])
+            mirrors[key] = (mirror, 1 - mirror.annual_failure, mirror.capacity,
+                    mirror.read_throughput, mirror.write_throughput)
+        return mirrors[key]
+
+    # An array never fails less often than any of its mirrors, so mirrors narrower than
+    # the narrowest that meets max_afr on its own can be skipped wholesale.
+    narrowest = 1
+    while not any(1 - mirror_metrics(block)[1] <= max_afr
+            for block in _generate_blocks(remaining, narrowest)):
+        narrowest += 1
+        if narrowest > width:
+            return
+
+    unplaced = len(disks)
+    chosen = []                 # Blocks placed so far.
+    placed = []                 # Mirrors of the blocks placed so far.
+    firsts = []                 # Value of first before each block was placed.
+    # Running array metrics at each depth: probability no mirror fails in a year,
+    # capacity, and slowest mirror read and write throughput.
+    survival = [1]
+    capacity = [0]
+    read = [float('inf')]
+    write = [float('inf')]
+    block = largest_block(None)
+
+    while True:
+        if block is None:
+            # Exhausted this depth; backtrack.
+            if not chosen:
+                return
+            block = chosen.pop()
+            placed.pop()
+            survival.pop()
+            capacity.pop()
+            read.pop()
+            write.pop()
+            for i, n in enumerate(block):
+                remaining[i] += n
+            unplaced += sum(block)
+            first = firsts.pop()
+            block = next_block(block)
+            continue
+
+        size = sum(block)
+        if size < unplaced < size + narrowest:
+            # Too few disks would be left for another mirror.
+            block = next_block(block)
+            continue
+
+        mirror, mirror_survival, mirror_capacity, mirror_read, mirror_write = mirror_metrics(block)
+        p = survival[-1] * mirror_survival
+        if 1 - p > max_afr:
+            block = next_block(block)
+            continue
+
+        if size == unplaced:
+            devices = len(placed) + 1
+            if capacity[-1] + mirror_capacity >= min_capacity and \
+                min(read[-1], mirror_read) * devices >= min_read and \
+                min(write[-1], mirror_write) * devices >= min_write:
+                yield DiskArray(placed + [mirror])
+            block = next_block(block)
+            continue
+
+        for i, n in enumerate(block):
+            remaining[i] -= n
+        unplaced -= size
+        chosen.append(block)
+        placed.append(mirror)
+        survival.append(p)
+        capacity.append(capacity[-1] + mirror_capacity)
+        read.append(min(read[-1], mirror_read))
+        write.append(min(write[-1], mirror_write))
+        firsts.append(first)
+        while not remaining[first]:
+            first += 1
+        block = largest_block(block)
 
 
 def generate_disk_configurations(
@@ -503,26 +779,257 @@ def generate_disk_configurations(
         min_read_throughput:int=0,          # Minimum read throughput in bytes per second.
         min_write_throughput:int=0,         # Minimum write throughput in bytes per second.
         max_afr:float=0.0001,               # Maximum annual failure rate.
-        max_cost:float=5000                 # Maximum cost in currency of choice.
+        max_cost:float=5000,                # Maximum cost in currency of choice.
+        mixed_mirrors:bool=False,           # Allow mirrors of different disk models.
+        max_mirror_width:int=None           # Maximum disks per mirror when mixing models.
         ):
     '''Generate list of configurations involving disks that satisfy constraints.'''
 
     if not disks:
-        selections = _generate_disk_selections(options, [], [], min_capacity, max_cost)
-        print("%i combinations of disks generated." % len(selections))
+        selections = _generate_disk_selections(options, min_capacity, max_cost)
     else:
         selections = disks
 
     configs = []
+    selection_count = 0
     for selection in selections:
-        _generate_disk_configurations(selection, [], configs, min_read_throughput,
-            min_write_throughput, min_capacity, max_afr)
+        selection_count += 1
+        if mixed_mirrors:
+            configs.extend(_generate_mixed_configurations(selection, min_read_throughput,
+                min_write_throughput, min_capacity, max_afr, max_mirror_width))
+        else:
+            configs.extend(_generate_disk_configurations(selection, min_read_throughput,
+                min_write_throughput, min_capacity, max_afr))
 
+    if not disks:
+        print("%i combinations of disks generated." % selection_count)
     print("%i viable configurations generated." % len(configs))
 
     return configs
 
 
+def _mirror_members(
+        device          # Mirror or Disk striped into a pool.
+        ):
+    '''Return the disks of device, treating a bare Disk as a one-disk mirror.'''
+    return device.devices if isinstance(device, Mirror) else [device]
+
+
+class Upgrade(object):
+    '''Incremental change to an existing pool: members of its mirrors replaced with larger
+       disks, disks attached to its mirrors and new mirrors striped in.'''
+    def __init__(self,
+                base:DiskArray,     # Existing pool.
+                changes:list,       # (Disks removed, Disks bought) for each mirror of base.
+                added:list          # List of new Mirrors.
+                ):
+
+        self._base = base
+        self._changes = changes
+        self._added = added
+
+        devices = []
+        for mirror, (removed, bought) in zip(base.devices, changes):
+            if not bought:
+                devices.append(mirror)
+                continue
+            disks = list(_mirror_members(mirror))
+            for disk in removed:
+                disks.remove(disk)
+            devices.append(Mirror(disks + bought))
+        self._pool = DiskArray(devices + added)
+
+
+    @property
+    def base(self):
+        '''Return the pool before the upgrade.'''
+        return self._base
+
+
+    @property
+    def pool(self):
+        '''Return the pool after the upgrade.'''
+        return self._pool
+
+
+    @property
+    def cost(self):
+        '''Return cost of disks to buy.'''
+        return sum([disk.cost for _, bought in self._changes for disk in bought]) + \
+                sum([mirror.cost for mirror in self._added])
+
+
+    @property
+    def tco(self):
+        '''Return increase in total cost of ownership over MISSION_LENGTH years.'''
+        # Removed disks were already paid for, so only the disks bought add to the cost.
+        return self.cost + (self._pool.annual_cost - self._base.annual_cost) * MISSION_LENGTH
+
+
+    @property
+    def capacity(self):
+        '''Return capacity of upgraded pool.'''
+        return self._pool.capacity
+
+
+    @property
+    def annual_failure(self):
+        '''Return probability of upgraded pool failing during one year.'''
+        return self._pool.annual_failure
+
+
+    @property
+    def read_throughput(self):
+        '''Return read throughput of upgraded pool in bytes per second.'''
+        return self._pool.read_throughput
+
+
+    @property
+    def write_throughput(self):
+        '''Return write throughput of upgraded pool in bytes per second.'''
+        return self._pool.write_throughput
+
+
+    def __repr__(self):
+        s = ''
+        for mirror, (removed, bought) in zip(self._base.devices, self._changes):
+            if removed:
+                s += 'Replace %s in %r with %s\n' % (' '.join([repr(disk) for disk in removed]),
+                        mirror, ' '.join([repr(disk) for disk in bought[:len(removed)]]))
+            if bought[len(removed):]:
+                s += 'Attach to %r: %s\n' % (mirror, ' '.join([repr(disk) for disk in bought[len(removed):]]))
+        for mirror in self._added:
+            s += 'Add %r\n' % mirror
+        return s.strip() or 'No changes'
+
+
+def _generate_mirror_changes(
+        mirrors:list,       # List of existing Mirrors and bare Disks.
+        options:list,       # List of Disks that can be bought.
+        max_cost:float,     # Maximum cost of all bought Disks.
+        max_width:int       # Maximum number of Disks in a widened Mirror.
+        ):
+    '''Generate (cost, changes) for every way of replacing members of mirrors and
+       attaching disks to them, where changes holds (Disks removed, Disks bought) per mirror.
+
+       Each mirror changes to at most one disk model. Its smallest members may be replaced
+       by a model larger than all of them, and the same model may be attached up to
+       max_width; attached disks are never smaller than the mirror. Identical mirrors,
+       wherever they are in the pool, are treated as interchangeable so that equivalent
+       plans are generated once.
+    '''
+    members = [_mirror_members(mirror) for mirror in mirrors]
+
+    # Visit identical mirrors one after another so that each run can be treated alike.
+    order = []
+    for i, mirror in enumerate(mirrors):
+        if i not in order:
+            order.extend([j for j in range(i, len(mirrors)) if j not in order and
+                members[j] == members[i] and type(mirrors[j]) is type(mirror)])
+    mirrors = [mirrors[i] for i in order]
+    members = [members[i] for i in order]
+
+    choices = []
+    for disks in members:
+        disks = sorted(disks, key=lambda disk: disk.capacity)
+        width = len(disks)
+        mirror_choices = [([], [])]
+        for option in options:
+            for replace in range(width + 1):
+                # Replacing disks only pays off if option is larger than each of them.
+                if replace and option.capacity <= disks[replace - 1].capacity:
+                    break
+                if not replace and option.capacity < disks[0].capacity:
+                    continue
+                for attach in range(max(max_width - width, 0) + 1):
+                    if replace or attach:
+                        mirror_choices.append((disks[:replace], [option] * (replace + attach)))
+        choices.append([(sum([disk.cost for disk in bought]), (removed, bought))
+            for removed, bought in mirror_choices])
+
+    changes = []
+    next_choice = [0]       # Index of next choice to try for the mirror at each depth.
+    running_cost = [0]
+
+    while next_choice:
+        depth = len(changes)
+        if depth == len(mirrors):
+            # Report changes in the pool's own mirror order.
+            result = [None] * len(order)
+            for i, change in zip(order, changes):
+                result[i] = change
+            yield running_cost[-1], result
+            next_choice.pop()
+        elif next_choice[-1] < len(choices[depth]):
+            idx = next_choice[-1]
+            next_choice[-1] = idx + 1
+            choice_cost, change = choices[depth][idx]
+            cost = running_cost[-1] + choice_cost
+            if cost > max_cost:
+                continue
+
+            changes.append(change)
+            running_cost.append(cost)
+            # An identical following mirror may only take this choice or a later one.
+            if depth + 1 < len(mirrors) and members[depth + 1] == members[depth] and \
+                    type(mirrors[depth + 1]) is type(mirrors[depth]):
+                next_choice.append(idx)
+            else:
+                next_choice.append(0)
+            continue
+        else:
+            next_choice.pop()
+
+        if changes:
+            changes.pop()
+            running_cost.pop()
+
+
+def generate_upgrades(
+        pool:DiskArray,                     # Existing stripe of Mirrors and/or Disks.
+        options:list,                       # List of Disks that can be acquired.
+        min_capacity:int=0,                 # Capacity of upgraded pool in bytes.
+        min_read_throughput:int=0,          # Minimum read throughput in bytes per second.
+        min_write_throughput:int=0,         # Minimum write throughput in bytes per second.
+        max_afr:float=0.0001,               # Maximum annual failure rate of upgraded pool.
+        max_cost:float=1000,                # Maximum to spend on new disks.
+        max_width:int=3                     # Maximum number of disks in a widened mirror.
+        ):
+    '''Generate list of upgrades of pool that satisfy constraints.
+
+       Existing mirrors are kept. The search covers replacing their smallest members with
+       larger disks, attaching disks to them, and adding new mirrors. A bare Disk in pool
+       is treated as a one-disk mirror.
+    '''
+
+    for device in pool.devices:
+        if isinstance(device, DiskArray) and not isinstance(device, Mirror):
+            raise ValueError('Only stripes of mirrors and disks can be upgraded; got %r.' % device)
+
+    upgrades = []
+    for selection in _generate_disk_selections(options, -1, max_cost):
+        selection_cost = sum([disk.cost for disk in selection])
+        if selection:
+            arrangements = [ary.devices for ary in
+                    _generate_disk_configurations(selection, 0, 0, 0, float('inf'))]
+        else:
+            arrangements = [[]]
+
+        for cost, changes in _generate_mirror_changes(pool.devices, options,
+                max_cost - selection_cost, max_width):
+            for added in arrangements:
+                upgrade = Upgrade(pool, changes, added)
+                if upgrade.capacity >= min_capacity and \
+                    upgrade.annual_failure <= max_afr and \
+                    upgrade.read_throughput >= min_read_throughput and \
+                    upgrade.write_throughput >= min_write_throughput:
+                    upgrades.append(upgrade)
+
+    print("%i viable upgrades generated." % len(upgrades))
+
+    return upgrades
+
+
 def print_pool_info(
         config:DiskArray,
         title:str=''):
@@ -553,6 +1060,16 @@ def print_notable_configs(
         print("No configs.")
         return
 
+    for att, config in _find_notable(configs).items():
+        print_pool_info(config, att)
+        print()
+
+
+def _find_notable(
+        configs:list    # Non-empty list of DiskArrays or Upgrades.
+        ):
+    '''Return dict of configs that are maximal/minimal on various attributes.'''
+
     notable_attributes = {
         'Cheapest': ['cost', '__lt__'],
         'Most Reliable': ['annual_failure', '__lt__'],
@@ -569,6 +1086,34 @@ def print_notable_configs(
             if getattr(getattr(config, test[0]), test[1])(getattr(notable[att], test[0])):
                 notable[att] = config
 
-    for att, config in notable.items():
-        print_pool_info(config, att)
+    return notable
+
+
+def print_upgrade_info(
+        upgrade:Upgrade,
+        title:str=''):
+    '''Pretty-print an upgrade plan and the resulting pool.'''
+
+    print('=== %sUpgrade  ===' % (title + ' '))
+    print(entab(repr(upgrade)))
+    print('Upgrade cost                                 ' + locale.currency(upgrade.cost, grouping=True))
+    print('Increase in total cost of ownership          ' + locale.currency(upgrade.tco, grouping=True))
+    print('Additional capacity (GB)                     {:n}'.format(
+        (upgrade.capacity - upgrade.base.capacity) / 1e9))
+    print()
+    print_pool_info(upgrade.pool, 'Upgraded')
+
+
+def print_notable_upgrades(
+        upgrades:list   # List of Upgrades.
+        ):
+    '''Pretty-print a list of notable upgrades that are maximal/minimal on various
+       attributes.'''
+
+    if not upgrades:
+        print("No upgrades.")
+        return
+
+    for att, upgrade in _find_notable(upgrades).items():
+        print_upgrade_info(upgrade, att)
         print()
@@ -0,0 +1,460 @@
+'''
+    Purpose:
+        Persist pool configurations and their metrics to disk so that large search results
+        can be queried again without re-running the search.
+
+    A store is a directory of fixed-width columns, one file per metric, plus a fixed-width
+    encoding of each configuration's layout. Every column has a sorted index of row
+    numbers. Columns and indexes are memory-mapped when read, so stores larger than
+    memory can be queried; indexes are built with an external merge sort for the same
+    reason.
+
+    Usage:
+        save_results('results', configs)
+
+        with ResultStore('results') as store:
+            for row in store.query({'capacity': (20e12, None), 'annual_failure': (None, 1e-5)},
+                    order_by='cost', limit=10):
+                print_pool_info(store.config(row))
+'''
+
+from array import array
+import heapq
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+
+import com.heresjono.raidcalc as raidcalc
+
+STORE_VERSION = 1
+
+METRICS = (                         # DiskArray properties stored for every configuration.
+    'cost',
+    'capacity',
+    'annual_failure',
+    'mission_loss',
+    'tco',
+    'read_throughput',
+    'write_throughput',
+    )
+
+VALUE_TYPE = 'd'                    # array typecode of metric columns.
+ROW_TYPE = 'Q'                      # array typecode of index entries.
+SLOT_TYPE = 'H'                     # array typecode of layout slots.
+
+EMPTY_SLOT = 0                      # Padding at the end of a layout.
+MIRROR_END = 0xFFFF                 # Terminates the disks of one mirror in a layout.
+MAX_CATALOG = MIRROR_END - 1        # Disk ids are stored offset by one.
+
+CHUNK_ROWS = 1 << 20                # Rows held in memory at once while writing/sorting.
+
+
+def _layout_slots(
+        config:raidcalc.DiskArray   # Configuration to measure.
+        ):
+    '''Return the number of layout slots needed to encode config.'''
+    return sum([len(mirror.devices) + 1 for mirror in config.devices])
+
+
+class ResultStoreWriter(object):
+    '''Streams configurations into a new result store.'''
+    def __init__(self,
+                path:str,               # Directory to create the store in; replaced if a store.
+                layout_width:int=64     # Layout slots per configuration; disks plus mirrors.
+                ):
+
+        if os.path.isdir(path) and os.listdir(path) and \
+                not os.path.exists(os.path.join(path, 'meta.json')):
+            raise ValueError('%s is not empty and holds no result store.' % path)
+
+        # The store is built next to path and moved into place when complete, so a failed
+        # write leaves any previous store intact.
+        path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._path = path
+        self._staging = tempfile.mkdtemp(prefix='.%s.' % os.path.basename(path),
+                dir=os.path.dirname(path))
+        self._tmp = os.path.join(self._staging, 'store')
+        os.mkdir(self._tmp)
+        self._layout_width = layout_width
+        self._catalog = {}              # Disk -> id.
+        self._disks = []                # Disks by id.
+        self._count = 0
+        self._layouts = array(SLOT_TYPE)
+        self._columns = {metric: array(VALUE_TYPE) for metric in METRICS}
+        self._files = {name: open(os.path.join(self._tmp, name + '.bin'), 'wb')
+                for name in ('layout',) + METRICS}
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self.abort()
+
+
+    @property
+    def count(self):
+        '''Return number of configurations added so far.'''
+        return self._count
+
+
+    def _disk_id(self, disk:raidcalc.Disk):
+        '''Return the catalog id for disk, adding it if necessary.'''
+        if disk not in self._catalog:
+            if raidcalc.DISK_TYPES.get(type(disk).__name__) is not type(disk):
+                raise ValueError('Cannot store disks of type %s.' % type(disk).__name__)
+            if len(self._disks) == MAX_CATALOG:
+                raise ValueError('Too many distinct disks for a result store.')
+            self._catalog[disk] = len(self._disks)
+            self._disks.append(disk)
+        return self._catalog[disk]
+
+
+    def add(self,
+            config:raidcalc.DiskArray   # Stripe of Mirrors to store.
+            ):
+        '''Append config to the store.'''
+        slots = []
+        for mirror in config.devices:
+            if not isinstance(mirror, raidcalc.Mirror):
+                raise ValueError('Only stripes of mirrors can be stored; got %r.' % mirror)
+            slots.extend([self._disk_id(disk) + 1 for disk in mirror.devices])
+            slots.append(MIRROR_END)
+
+        if len(slots) > self._layout_width:
+            raise ValueError('Configuration needs %i layout slots; store has %i.'
+                    % (len(slots), self._layout_width))
+
+        self._layouts.extend(slots)
+        self._layouts.extend([EMPTY_SLOT] * (self._layout_width - len(slots)))
+        for metric, column in self._columns.items():
+            column.append(getattr(config, metric))
+
+        self._count += 1
+        if self._count % CHUNK_ROWS == 0:
+            self._flush()
+
+
+    def _flush(self):
+        '''Write buffered rows to disk.'''
+        self._layouts.tofile(self._files['layout'])
+        del self._layouts[:]
+        for metric, column in self._columns.items():
+            column.tofile(self._files[metric])
+            del column[:]
+
+
+    def abort(self):
+        '''Stop writing and discard the new store, leaving path as it was.'''
+        if self._files is None:
+            return
+
+        for f in self._files.values():
+            f.close()
+        self._files = None
+        shutil.rmtree(self._staging)
+
+
+    def close(self):
+        '''Finish writing columns, write metadata and indexes, then replace any store
+           at path with the new one.'''
+        if self._files is None:
+            return
+
+        try:
+            self._finish()
+        except BaseException:
+            shutil.rmtree(self._staging)
+            raise
+
+        if os.path.exists(self._path):
+            os.rename(self._path, os.path.join(self._staging, 'old'))
+        os.rename(self._tmp, self._path)
+        shutil.rmtree(self._staging)
+
+
+    def _finish(self):
+        '''Write remaining rows, indexes and metadata to the new store.'''
+        self._flush()
+        for f in self._files.values():
+            f.close()
+        self._files = None
+
+        for metric in METRICS:
+            _build_index(self._tmp, metric, self._count)
+
+        meta = {
+            'version': STORE_VERSION,
+            'byteorder': sys.byteorder,
+            'count': self._count,
+            'layout_width': self._layout_width,
+            'mission_length': getattr(raidcalc, 'MISSION_LENGTH', None),
+            'disks': [{
+                'type': type(disk).__name__,
+                'name': disk.name,
+                'capacity': disk.capacity,
+                'speed': disk.read_throughput,
+                'afr': disk.annual_failure,
+                'cost': disk.cost,
+                'replacement_time': disk.replacement_time,
+                } for disk in self._disks],
+        }
+        with open(os.path.join(self._tmp, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=4)
+
+
+def _read_run(
+        values_path:str,    # File of sorted values.
+        rows_path:str,      # File of row numbers matching values.
+        count:int           # Number of entries in the run.
+        ):
+    '''Generate (value, row) pairs of a sorted run without loading all of it.'''
+    block = max(1, CHUNK_ROWS // 16)
+    with open(values_path, 'rb') as vf, open(rows_path, 'rb') as rf:
+        while count:
+            n = min(block, count)
+            values = array(VALUE_TYPE)
+            rows = array(ROW_TYPE)
+            values.fromfile(vf, n)
+            rows.fromfile(rf, n)
+            yield from zip(values, rows)
+            count -= n
+
+
+def _build_index(
+        path:str,       # Store directory.
+        metric:str,     # Column to index.
+        count:int       # Number of rows in column.
+        ):
+    '''Write metric.idx, the row numbers of metric sorted by value, then row number.'''
+    with tempfile.TemporaryDirectory(dir=path) as tmp:
+        runs = []
+        with open(os.path.join(path, metric + '.bin'), 'rb') as f:
+            start = 0
+            while start < count:
+                values = array(VALUE_TYPE)
+                values.fromfile(f, min(CHUNK_ROWS, count - start))
+                order = sorted(range(len(values)), key=values.__getitem__)
+                run = (os.path.join(tmp, '%i.val' % len(runs)),
+                        os.path.join(tmp, '%i.row' % len(runs)),
+                        len(values))
+                with open(run[0], 'wb') as vf:
+                    array(VALUE_TYPE, [values[i] for i in order]).tofile(vf)
+                with open(run[1], 'wb') as rf:
+                    array(ROW_TYPE, [start + i for i in order]).tofile(rf)
+                runs.append(run)
+                start += len(values)
+
+        with open(os.path.join(path, metric + '.idx'), 'wb') as f:
+            rows = array(ROW_TYPE)
+            for _, row in heapq.merge(*[_read_run(*run) for run in runs]):
+                rows.append(row)
+                if len(rows) == CHUNK_ROWS:
+                    rows.tofile(f)
+                    del rows[:]
+            rows.tofile(f)
+
+
+def save_results(
+        path:str,               # Directory to create the store in.
+        configs:list,           # DiskArrays to store.
+        layout_width:int=None   # Layout slots per configuration; fit to configs by default.
+        ):
+    '''Write configs to a new result store at path, replacing any store already there, and
+       return the number stored.'''
+    if layout_width is None:
+        configs = list(configs)
+        layout_width = max([_layout_slots(config) for config in configs], default=1)
+
+    with ResultStoreWriter(path, layout_width) as writer:
+        for config in configs:
+            writer.add(config)
+        return writer.count
+
+
+class ResultStore(object):
+    '''Read-only, memory-mapped view of a result store.'''
+    def __init__(self,
+                path:str        # Directory of the store.
+                ):
+
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta['version'] != STORE_VERSION:
+            raise ValueError('Unsupported result store version %r.' % meta['version'])
+        if meta['byteorder'] != sys.byteorder:
+            raise ValueError('Result store was written on a %s-endian machine.' % meta['byteorder'])
+
+        self._count = meta['count']
+        self._layout_width = meta['layout_width']
+        self._mission_length = meta['mission_length']
+        self._disks = [raidcalc.disk_from_spec(disk) for disk in meta['disks']]
+        self._maps = []
+        self._layouts = self._map(os.path.join(path, 'layout.bin'), SLOT_TYPE)
+        self._columns = {metric: self._map(os.path.join(path, metric + '.bin'), VALUE_TYPE)
+                for metric in METRICS}
+        self._indexes = {metric: self._map(os.path.join(path, metric + '.idx'), ROW_TYPE)
+                for metric in METRICS}
+
+
+    def _map(self, path:str, typecode:str):
+        '''Return a typed, read-only view of the file at path.'''
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(array(typecode)).toreadonly()
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mm)
+        return memoryview(mm).cast(typecode)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    def __len__(self):
+        return self._count
+
+
+    def close(self):
+        '''Release all memory maps.'''
+        for view in [self._layouts] + list(self._columns.values()) + list(self._indexes.values()):
+            view.release()
+        for mm in self._maps:
+            mm.close()
+        self._maps = []
+
+
+    @property
+    def mission_length(self):
+        '''Return MISSION_LENGTH in effect when the store was written.'''
+        return self._mission_length
+
+
+    def column(self, metric:str):
+        '''Return metric values of every row.'''
+        return self._columns[metric]
+
+
+    def value(self, metric:str, row:int):
+        '''Return metric value of row.'''
+        return self._columns[metric][row]
+
+
+    def config(self, row:int):
+        '''Return the DiskArray stored at row.'''
+        mirrors = []
+        disks = []
+        start = row * self._layout_width
+        for slot in self._layouts[start:start + self._layout_width]:
+            if slot == EMPTY_SLOT:
+                break
+            if slot == MIRROR_END:
+                mirrors.append(raidcalc.Mirror(disks))
+                disks = []
+            else:
+                disks.append(self._disks[slot - 1])
+        return raidcalc.DiskArray(mirrors)
+
+
+    def _bound(self,
+            metric:str,         # Indexed column to search.
+            value:float,        # Value to search for.
+            inclusive:bool      # Whether to skip past entries equal to value.
+            ):
+        '''Return the first index position whose metric is above value (inclusive) or
+           not below it (not inclusive).'''
+        column = self._columns[metric]
+        index = self._indexes[metric]
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            v = column[index[mid]]
+            if v < value or (inclusive and v == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+    def _range(self, metric:str, bounds:tuple):
+        '''Return index positions [start, stop) of rows with metric within bounds.'''
+        low, high = bounds
+        start = 0 if low is None else self._bound(metric, low, False)
+        stop = self._count if high is None else self._bound(metric, high, True)
+        return start, max(start, stop)
+
+
+    def query(self,
+            where:dict=None,        # Metric -> (min, max); None for an open end. Inclusive.
+            order_by:str=None,      # Metric to sort results by.
+            descending:bool=False,  # Sort largest first.
+            limit:int=None          # Maximum number of rows to return.
+            ):
+        '''Return row numbers of configurations within bounds, ordered by order_by.
+
+           E.g., cheapest pools of at least 20 TB that fail at most once in 100000 years:
+
+           store.query({'capacity': (20e12, None), 'annual_failure': (None, 1e-5)},
+                   order_by='cost')
+        '''
+        where = where or {}
+        for metric in list(where) + ([order_by] if order_by else []):
+            if metric not in METRICS:
+                raise ValueError('Unknown metric %r.' % metric)
+
+        ranges = {metric: self._range(metric, bounds) for metric, bounds in where.items()}
+        if not ranges:
+            ranges[order_by or METRICS[0]] = (0, self._count)
+        if any([start == stop for start, stop in ranges.values()]) or limit == 0:
+            return []
+
+        checks = [(self._columns[metric], low, high) for metric, (low, high) in where.items()]
+
+        def matches(row):
+            for column, low, high in checks:
+                value = column[row]
+                if (low is not None and value < low) or (high is not None and value > high):
+                    return False
+            return True
+
+        # Either gather the rows of the most selective index and sort them, or walk the
+        # order_by index and stop at limit. Estimate which touches fewer rows.
+        scan = min(ranges, key=lambda metric: ranges[metric][1] - ranges[metric][0])
+        scan_size = ranges[scan][1] - ranges[scan][0]
+        if order_by and limit is not None:
+            start, stop = ranges.get(order_by, (0, self._count))
+            selectivity = 1
+            for metric, (s, e) in ranges.items():
+                if metric != order_by:
+                    selectivity *= (e - s) / self._count
+            if limit / selectivity < scan_size:
+                positions = range(stop - 1, start - 1, -1) if descending else range(start, stop)
+                index = self._indexes[order_by]
+                result = []
+                for position in positions:
+                    row = index[position]
+                    if matches(row):
+                        result.append(row)
+                        if len(result) == limit:
+                            break
+                return result
+
+        index = self._indexes[scan]
+        rows = [index[position] for position in range(*ranges[scan])]
+        rows = sorted([row for row in rows if matches(row)])
+        if order_by:
+            column = self._columns[order_by]
+            rows.sort(key=lambda row: (column[row], row), reverse=descending)
+        return rows if limit is None else rows[:limit]
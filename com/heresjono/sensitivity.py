@@ -0,0 +1,214 @@
+'''
+    Purpose:
+        Measure how pool metrics respond to the parameters of the disks in the pool.
+
+    Every distinct Disk object in a pool is a parameter set; disks repeated by reference
+    (e.g., [disk] * 4) vary together. Sensitivities are elasticities, the relative change
+    in a metric per relative change in a parameter, together with the metric at a low
+    and a high value of the parameter for tornado charts. Uncertainty sampling draws
+    every parameter from a log-normal distribution around its nominal value.
+'''
+
+import locale
+import random
+import statistics
+
+import com.heresjono.raidcalc as raidcalc
+
+PARAMETERS = ('afr', 'speed', 'replacement_time', 'cost')       # Varied Disk parameters.
+METRICS = ('annual_failure', 'mission_loss', 'tco')             # Measured DiskArray metrics.
+
+MAX_AFR = 0.99          # Sampled annual failure rates are capped below certain failure.
+
+
+def _disk_params(
+        disk:raidcalc.Disk
+        ):
+    '''Return dict of disk's constructor parameters.'''
+    return {
+        'name': disk.name,
+        'capacity': disk.capacity,
+        'speed': disk.read_throughput,
+        'afr': disk.annual_failure,
+        'cost': disk.cost,
+        'replacement_time': disk.replacement_time,
+        }
+
+
+def _find_disks(
+        config:raidcalc.DiskArray
+        ):
+    '''Return list of (label, Disk) for each distinct Disk in config, in order of
+       appearance. Labels are disk names, numbered if names are shared.'''
+    disks = []
+    pending = list(config.devices)
+    while pending:
+        device = pending.pop(0)
+        if isinstance(device, raidcalc.DiskArray):
+            pending[:0] = device.devices
+        elif device not in disks:
+            disks.append(device)
+
+    names = [disk.name for disk in disks]
+    seen = {}
+    result = []
+    for disk in disks:
+        if names.count(disk.name) > 1:
+            seen[disk.name] = seen.get(disk.name, 0) + 1
+            result.append(('%s #%i' % (disk.name, seen[disk.name]), disk))
+        else:
+            result.append((disk.name, disk))
+    return result
+
+
+def _substitute(
+        device,                     # Disk, Mirror or DiskArray to copy.
+        replacements:dict           # Disk -> Disk to use instead.
+        ):
+    '''Return device with disks swapped according to replacements, reusing any part of
+       it that holds none of them.'''
+    if not isinstance(device, raidcalc.DiskArray):
+        return replacements.get(device, device)
+    devices = [_substitute(member, replacements) for member in device.devices]
+    if all([new is old for new, old in zip(devices, device.devices)]):
+        return device
+    return type(device)(devices)
+
+
+def _evaluate(
+        config:raidcalc.DiskArray,  # Pool to perturb.
+        columns:dict,               # (Disk, parameter) -> list of values, one per scenario.
+        count:int                   # Number of scenarios.
+        ):
+    '''Return dict of metric -> list of values, one per scenario.
+
+       Each scenario is evaluated by the pool's own Disk, Mirror and DiskArray classes,
+       using copies of the disks with the scenario's parameters.
+    '''
+    overrides = {}
+    for (disk, param), values in columns.items():
+        overrides.setdefault(disk, []).append(('_' + param, values))
+
+    results = {metric: [] for metric in METRICS}
+    for i in range(count):
+        replacements = {}
+        for disk, params in overrides.items():
+            # Disk keeps each constructor parameter in an attribute of the same name with
+            # a leading underscore; copying keeps any subclass behaviour.
+            replacement = object.__new__(type(disk))
+            replacement.__dict__.update(disk.__dict__)
+            for attribute, values in params:
+                setattr(replacement, attribute, values[i])
+            replacements[disk] = replacement
+        ary = _substitute(config, replacements)
+        for metric in METRICS:
+            results[metric].append(getattr(ary, metric))
+    return results
+
+
+def sensitivities(
+        config:raidcalc.DiskArray,  # Pool to analyze.
+        step:float=0.01,            # Relative perturbation for elasticities.
+        swing:float=0.2             # Relative perturbation for tornado low/high values.
+        ):
+    '''Return dict of metric -> list of (disk label, parameter, elasticity, metric at low,
+       metric at high), largest swing first.'''
+
+    disks = _find_disks(config)
+    keys = [(label, disk, param) for label, disk in disks for param in PARAMETERS]
+
+    # Scenario 0 is nominal; every parameter then gets four perturbed scenarios.
+    count = 1 + 4 * len(keys)
+    columns = {}
+    for i, (_, disk, param) in enumerate(keys):
+        value = _disk_params(disk)[param]
+        if (disk, param) not in columns:
+            columns[(disk, param)] = [value] * count
+        for j, factor in enumerate((1 - step, 1 + step, 1 - swing, 1 + swing)):
+            perturbed = value * factor
+            if param == 'afr':
+                perturbed = min(perturbed, MAX_AFR)
+            columns[(disk, param)][1 + 4 * i + j] = perturbed
+    results = _evaluate(config, columns, count)
+
+    table = {metric: [] for metric in METRICS}
+    for metric in METRICS:
+        values = results[metric]
+        nominal = values[0]
+        for i, (label, _, param) in enumerate(keys):
+            down, up, low, high = values[1 + 4 * i:5 + 4 * i]
+            elasticity = (up - down) / (2 * step * nominal) if nominal else 0.0
+            table[metric].append((label, param, elasticity, low, high))
+
+    for rows in table.values():
+        rows.sort(key=lambda row: abs(row[4] - row[3]), reverse=True)
+    return table
+
+
+def sample_metrics(
+        config:raidcalc.DiskArray,  # Pool to analyze.
+        uncertainty:dict,           # Parameter -> log-normal sigma of its relative error.
+        draws:int=1000,             # Number of samples; at least 2.
+        seed:int=None               # Seed for reproducible samples.
+        ):
+    '''Return dict of metric -> sorted list of sampled values.
+
+       E.g., uncertainty={'afr': 0.5, 'replacement_time': 0.25} draws each disk's AFR and
+       replacement time independently, leaving speed and cost fixed.
+    '''
+
+    for param in uncertainty:
+        if param not in PARAMETERS:
+            raise ValueError('Unknown parameter %r.' % param)
+    if draws < 2:
+        raise ValueError('At least 2 draws are needed for percentiles; got %r.' % draws)
+
+    rng = random.Random(seed)
+    columns = {}
+    for _, disk in _find_disks(config):
+        params = _disk_params(disk)
+        for param, sigma in uncertainty.items():
+            values = [params[param] * rng.lognormvariate(0, sigma) for _ in range(draws)]
+            if param == 'afr':
+                values = [min(value, MAX_AFR) for value in values]
+            columns[(disk, param)] = values
+
+    results = _evaluate(config, columns, draws)
+    return {metric: sorted(results[metric]) for metric in METRICS}
+
+
+def _format_metric(
+        metric:str,     # Name of metric.
+        value:float
+        ):
+    '''Return value formatted for display.'''
+    if metric == 'tco':
+        return locale.currency(value, grouping=True)
+    return '1 in {:n}'.format(int(1 / max(value, 1e-25)))
+
+
+def print_sensitivity_info(
+        table:dict,     # As returned by sensitivities.
+        top:int=10      # Number of parameters to show per metric.
+        ):
+    '''Pretty-print the most influential parameters for each metric.'''
+
+    for metric, rows in table.items():
+        print('=== %s sensitivity ===' % metric)
+        for label, param, elasticity, low, high in rows[:top]:
+            print('    {:<36}{:>+10.3f}    {} .. {}'.format(
+                '%s %s' % (label, param), elasticity,
+                _format_metric(metric, low), _format_metric(metric, high)))
+        print()
+
+
+def print_uncertainty_info(
+        samples:dict    # As returned by sample_metrics.
+        ):
+    '''Pretty-print median and 5th/95th percentiles of sampled metrics.'''
+
+    for metric, values in samples.items():
+        cuts = statistics.quantiles(values, n=20)
+        print('{:<45}{} (5%: {}, 95%: {})'.format(metric,
+            _format_metric(metric, statistics.median(values)),
+            _format_metric(metric, cuts[0]), _format_metric(metric, cuts[-1])))
@@ -66,7 +66,10 @@ com.heresjono.raidcalc.MISSION_LENGTH = 3           # How long to keep things ru
 MAX_FAILURE = 1 / 10000                             # 1 in 10000 chance of losing pool during mission.
 MIN_CAPACITY = 6e12                                 # Minimum of 6 TB of data in array.
 
-# The optimizer never pairs mismatched disks into a mirror.
+MIXED_MIRRORS = False                               # Allow mirrors of mismatched disks.
+MAX_MIRROR_WIDTH = None                             # Most disks in a mixed mirror; None for no limit.
+
+# Unless MIXED_MIRRORS is set, the optimizer never pairs mismatched disks into a mirror.
 ARRANGEMENT = []
 ARRANGEMENT.extend([HDD('WD4TB', 4e12, cost=170)] * 7)      # 7x 4TB drives
 ARRANGEMENT.extend([HDD('WD8TB', 8e12, cost=305)] * 6)      # 6x 8TB drives
@@ -80,5 +83,7 @@ if __name__ == '__main__':
             disks=[ARRANGEMENT],
             max_afr=1 - ((1 - MAX_FAILURE) ** (1 / com.heresjono.raidcalc.MISSION_LENGTH)),
             min_capacity=MIN_CAPACITY,
-            max_cost=1e10)
+            max_cost=1e10,
+            mixed_mirrors=MIXED_MIRRORS,
+            max_mirror_width=MAX_MIRROR_WIDTH)
     print_notable_configs(configs)
\ No newline at end of file
@@ -66,6 +66,7 @@ com.heresjono.raidcalc.MISSION_LENGTH = 3               # How long to keep thing
 MAX_FAILURE = 1 / 10000                                 # 1 in 10000 chance of losing pool during mission.
 MIN_CAPACITY = 6e12                                     # Minimum of 6 TB of data in array.
 MAX_COST = 1500                                         # Spend no more than $1500 on disks.
+RESULT_STORE = None                                     # Directory to save viable configurations to.
 
 DISK_CHOICES = [                                        # What disks are being considered?
     # The following values are for new drives in Canada (after taxes).
@@ -84,4 +85,7 @@ if __name__ == '__main__':
             max_afr=1 - ((1 - MAX_FAILURE) ** (1 / com.heresjono.raidcalc.MISSION_LENGTH)),
             min_capacity=MIN_CAPACITY,
             max_cost=MAX_COST)
+    if RESULT_STORE:
+        from com.heresjono.resultstore import save_results
+        save_results(RESULT_STORE, configs)
     print_notable_configs(configs)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+'''
+    Author: Jonathan Lung (https://github.com/lungj)
+    ETH/ETC donations: 0xc5500095A395B4FB3ba81bB0D8e316c675d1F47C
+    Because disks don't hoard themselves.
+
+    Purpose:
+        Find incremental upgrades of an existing disk pool that achieve capacity and
+        reliability targets: small disks in existing mirrors replaced with larger ones,
+        disks attached to existing mirrors and new mirrors added.
+
+    Usage:
+        python3 raid_upgrade.py
+
+    Optimization parameters can be set below. Search for "USER CONFIGURATION."
+    If optimization is taking too long, try a lower max cost and/or reducing the number of
+    disk choices available for the pool.
+
+    Output for probabilities is given as odds. For morbid comparison, over the course of
+    your lifetime, historically, you are likely to experience (US numbers):
+
+        Death by terrorist                      1 in 5 000 000
+        Death by lightning                      1 in 700 000
+        Death by asteroid strike                1 in 75 000
+        Death by accidental gunshot wound       1 in 8 000
+        Death by peptic ulcer disease           1 in 700
+        Death by car accident                   1 in 77
+        Death by heart-disease                  1 in 7
+        Death                                   1 in 1
+
+    Disclaimer:
+        Standard disclaimer. Execution of the bytes contained herein are at your own risk.
+
+        The values produced are probabilities; a supposedly reliable system could break in
+        a week or vice-versa. No guarantees are provided on the correctness of the
+        outputs. In other words, this program cannot predict the future.
+
+        Some of the maths here are approximations that work for "realistic" inputs.
+        So don't go setting annual failure rate (AFR) to 0.9 (90%).
+
+        Garbage in, garbage out.
+        Speed measurements are for sequential throughput only.
+        Assumes write endurance of SSDs is not a limiting factor.
+        Defaults may not be reflective of your assumptions.
+
+        Assumes remainder of system is no a bottleneck.
+
+        These failure rate results assume the rest of the system is 100% reliable.
+        These failure rate results assume disk failures are independent and evenly
+        distributed. Always make backups!
+        RAID/REDUNDANCY IS NOT A BACKUP.
+        KEEP THE BACKUPS OFF-SITE!
+
+        DON'T FORGET TO INCORPORATE THE COST OF BACKUPS AND REPLACEMENT DISKS INTO YOUR
+        COSTS! And, of course, things like the device housing everything, electricity,
+        shipping, etc. This program does not optimize on enclosure costs for large arrays.
+
+        TCO costs are approximations in NPV and do not account for things like taxes and
+        technology getting cheaper.
+'''
+from com.heresjono.raidcalc import HDD, SSD, DiskArray, Mirror, generate_upgrades, print_notable_upgrades
+import com.heresjono.raidcalc
+import locale
+
+###### USER CONFIGURATION ######
+com.heresjono.raidcalc.MISSION_LENGTH = 3               # How long to keep things running in years.
+MAX_FAILURE = 1 / 1000                                  # 1 in 1000 chance of losing pool during mission.
+MIN_CAPACITY = 20e12                                    # Minimum of 20 TB of data in upgraded array.
+MAX_COST = 1500                                         # Spend no more than $1500 on new disks.
+MAX_WIDTH = 3                                           # Widen mirrors to at most 3 disks.
+
+WD8TB = HDD('WD8TB', 8e12, afr=0.06, cost=305, replacement_time=96)      # Ship and shuck.
+WD12TB = HDD('WD12TB', 12e12, afr=0.06, cost=420, replacement_time=96)   # Ship and shuck.
+
+POOL = DiskArray([                                      # Existing pool: 2 stripes of mirrored drives.
+            Mirror([WD8TB, WD8TB]),
+            Mirror([WD8TB, WD8TB]),
+            ])
+
+DISK_CHOICES = [WD8TB, WD12TB]                          # What disks can be bought?
+###### END USER CONFIGURATION ######
+
+
+if __name__ == '__main__':
+    locale.setlocale(locale.LC_ALL, '')
+    upgrades = generate_upgrades(
+            POOL,
+            DISK_CHOICES,
+            max_afr=1 - ((1 - MAX_FAILURE) ** (1 / com.heresjono.raidcalc.MISSION_LENGTH)),
+            min_capacity=MIN_CAPACITY,
+            max_cost=MAX_COST,
+            max_width=MAX_WIDTH)
+    print_notable_upgrades(upgrades)
@@ -0,0 +1,103 @@
+'''
+    Purpose:
+        Check the iterative disk selection and arrangement enumerators against the
+        recursive ones they replaced, which are kept here as the reference.
+'''
+
+import contextlib
+import io
+import unittest
+
+import com.heresjono.raidcalc as raidcalc
+
+A = raidcalc.HDD('A', 4e12, cost=170)
+B = raidcalc.HDD('B', 8e12, afr=0.06, cost=305)
+C = raidcalc.SSD('C', 1e12, cost=190)
+
+
+def _reference_selections(options, chosen, results, min_capacity, max_cost,
+        running_cost=0, running_capacity=0):
+    if running_cost > max_cost:
+        return results
+
+    if running_capacity > min_capacity:
+        results.append(chosen)
+
+    for idx, option in enumerate(options):
+        _reference_selections(options[idx:], chosen + [option], results, min_capacity,
+                max_cost, running_cost + option.cost, running_capacity + option.capacity)
+
+    return results
+
+
+def _reference_partitions(item, count, maxlen, chosen, result):
+    if count == 0:
+        result.append(chosen)
+        return
+
+    for i in range(min(count, maxlen), 0, -1):
+        _reference_partitions(item, count - i, i, chosen + [[item] * i], result)
+
+
+def _reference_configurations(disks, chosen, configs, min_read, min_write, min_capacity, max_afr):
+    if not disks:
+        ary = raidcalc.DiskArray([raidcalc.Mirror(mirror[:]) for mirror in chosen])
+        if ary.capacity >= min_capacity and \
+            ary.annual_failure <= max_afr and \
+            ary.read_throughput >= min_read and \
+            ary.write_throughput >= min_write:
+            configs.append(ary)
+        return
+
+    same = raidcalc.count_sames(disks)
+    partitions = []
+    _reference_partitions(disks[0], same, same, [], partitions)
+    for partition in partitions:
+        _reference_configurations(disks[same:], chosen + partition, configs, min_read,
+            min_write, min_capacity, max_afr)
+
+
+class TestEnumeration(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        raidcalc.MISSION_LENGTH = 3
+
+    def tearDown(self):
+        if self.mission_length is None:
+            del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+    def test_selections(self):
+        for min_capacity, max_cost in ((-1, 0), (0, 700), (6e12, 1500), (20e12, 1200)):
+            got = [selection[:] for selection in
+                raidcalc._generate_disk_selections([A, B, C], min_capacity, max_cost)]
+            self.assertEqual(got, _reference_selections([A, B, C], [], [], min_capacity, max_cost))
+
+    def test_partitions(self):
+        for count in range(8):
+            want = []
+            _reference_partitions(A, count, count, [], want)
+            self.assertEqual(raidcalc.generate_partitions(A, count), want)
+
+    def test_configurations(self):
+        for disks, max_afr in (([A] * 4 + [B] * 3, 1), ([A] * 2 + [B] * 5 + [C] * 3, 1e-3), ([C], 1)):
+            want = []
+            _reference_configurations(disks, [], want, 0, 150e6, 4e12, max_afr)
+            got = raidcalc._generate_disk_configurations(disks, 0, 150e6, 4e12, max_afr)
+            self.assertEqual([repr(ary) for ary in got], [repr(ary) for ary in want])
+
+    def test_search_order_unchanged(self):
+        want = []
+        for selection in _reference_selections([A, B, C], [], [], 6e12, 1500):
+            _reference_configurations(selection, [], want, 0, 0, 6e12, 1e-3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            got = raidcalc.generate_disk_configurations([A, B, C], min_capacity=6e12,
+                    max_afr=1e-3, max_cost=1500)
+        self.assertGreater(len(want), 0)
+        self.assertEqual([repr(ary) for ary in got], [repr(ary) for ary in want])
+
+
+if __name__ == '__main__':
+    unittest.main()
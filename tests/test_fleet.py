@@ -0,0 +1,133 @@
+'''
+    Purpose:
+        Check fleet inventory loading and bulk evaluation.
+'''
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import com.heresjono.fleet as fleet
+import com.heresjono.raidcalc as raidcalc
+
+SPECS = {
+    'A': {'name': 'A', 'capacity': 4e12, 'cost': 170},
+    'B': {'type': 'HDD', 'name': 'B', 'capacity': 8e12, 'afr': 0.06, 'cost': 305},
+    'C': {'type': 'SSD', 'name': 'C', 'capacity': 1e12, 'cost': 190},
+    }
+
+POOLS = {
+    'p1': [['A', 'B'], ['B', 'B']],
+    'p2': [['B', 'B'], ['B', 'A']],         # Same layout as p1.
+    'p3': [['C', 'C']],
+    'p4': [['A', 'A', 'A'], ['C', 'B']],
+    'p5': [['B', 'C'], ['A', 'A', 'A']],    # Same layout as p4.
+    'p6': [['A', 'A'], ['B', 'B'], ['C', 'C']],
+    'p7': [['B', 'B', 'B']],
+    }
+
+
+class FleetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        raidcalc.MISSION_LENGTH = 3
+        self.batch_size = fleet.BATCH_SIZE
+
+    def tearDown(self):
+        fleet.BATCH_SIZE = self.batch_size
+        if self.mission_length is None:
+            del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+
+class TestEvaluate(FleetTestCase):
+
+    def test_layout_key_ignores_order(self):
+        self.assertEqual(fleet.layout_key(POOLS['p1']), fleet.layout_key(POOLS['p2']))
+        self.assertNotEqual(fleet.layout_key(POOLS['p1']), fleet.layout_key(POOLS['p4']))
+
+    def test_metrics_match_model(self):
+        disks = {name: raidcalc.disk_from_spec(spec) for name, spec in SPECS.items()}
+        rows = fleet.evaluate_fleet(SPECS, POOLS, processes=1)
+        self.assertEqual([name for name, _ in rows], list(POOLS))
+        for name, metrics in rows:
+            ary = raidcalc.DiskArray([raidcalc.Mirror([disks[disk] for disk in mirror])
+                for mirror in POOLS[name]])
+            for metric in fleet.METRICS:
+                if metric == 'annual_replacements':
+                    expected = sum([mirror.rebuilds_per_year for mirror in ary.devices])
+                else:
+                    expected = getattr(ary, metric)
+                self.assertAlmostEqual(metrics[metric], expected, delta=1e-12 * abs(expected))
+
+    def test_same_layouts_evaluated_once(self):
+        evaluated = []
+        evaluate_batch = fleet._evaluate_batch
+
+        def record(keys):
+            evaluated.extend(keys)
+            return evaluate_batch(keys)
+
+        fleet._evaluate_batch = record
+        try:
+            rows = dict(fleet.evaluate_fleet(SPECS, POOLS, processes=1))
+        finally:
+            fleet._evaluate_batch = evaluate_batch
+
+        self.assertEqual(len(evaluated), len(set([fleet.layout_key(pool) for pool in POOLS.values()])))
+        self.assertEqual(len(evaluated), len(set(evaluated)))
+        self.assertEqual(rows['p1'], rows['p2'])
+        self.assertEqual(rows['p4'], rows['p5'])
+
+    def test_worker_processes_match_in_process(self):
+        fleet.BATCH_SIZE = 2        # Several batches, so the work really is spread out.
+        single = fleet.evaluate_fleet(SPECS, POOLS, processes=1)
+        multi = fleet.evaluate_fleet(SPECS, POOLS, processes=2)
+        self.assertEqual(multi, single)
+
+
+class TestLoadInventory(FleetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        super().tearDown()
+
+    def load(self, inventory):
+        path = os.path.join(self.dir, 'fleet.json')
+        with open(path, 'w') as f:
+            json.dump(inventory, f)
+        return fleet.load_inventory(path)
+
+    def test_round_trip(self):
+        specs, pools = self.load({'disks': list(SPECS.values()), 'pools': POOLS})
+        self.assertEqual(specs, SPECS)
+        self.assertEqual(pools, POOLS)
+
+    def test_bad_inventories(self):
+        disks = list(SPECS.values())
+        for inventory, message in (
+                ([], 'JSON object'),
+                ({'disks': disks}, 'JSON object'),
+                ({'disks': [{'capacity': 1}], 'pools': {}}, 'needs a "name"'),
+                ({'disks': [{'name': 'X', 'capacity': 1, 'size': 2}], 'pools': {}}, "Bad disk 'X'"),
+                ({'disks': disks, 'pools': {'p': []}}, 'Pool p has no mirrors'),
+                ({'disks': disks, 'pools': {'p': [['A'], []]}}, 'Pool p has an empty mirror'),
+                ({'disks': disks, 'pools': {'p': [['A', 'Z']]}}, "unknown disk 'Z'"),
+                ({'disks': disks, 'pools': {'p': ['A']}}, 'list of mirrors'),
+                ):
+            with self.subTest(inventory=inventory):
+                with self.assertRaises(ValueError) as raised:
+                    self.load(inventory)
+                self.assertIn(message, str(raised.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+'''
+    Purpose:
+        Check that the command line interface reports bad input as usage errors.
+'''
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import com.heresjono.__main__ as cli
+import com.heresjono.raidcalc as raidcalc
+
+
+class TestBadInput(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        if self.mission_length is None:
+            if hasattr(raidcalc, 'MISSION_LENGTH'):
+                del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            json.dump(content, f)
+        return path
+
+    def assertUsageError(self, argv, message):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+            cli.main(argv)
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn(message, stderr.getvalue())
+
+    def evaluate(self, *argv):
+        return ['evaluate', '--disk', 'A:capacity=4e12', '--mirror', 'A,A', '--json'] + list(argv)
+
+    def test_bad_constraints(self):
+        self.assertUsageError(self.evaluate('--constraints', self.write('c.json', {'max_cost': 'abc'})),
+                'max_cost')
+        self.assertUsageError(self.evaluate('--constraints', self.write('c.json', [1])),
+                'must be a JSON object')
+        self.assertUsageError(self.evaluate('--mission-length', '0'), 'Mission length')
+
+    def test_bad_catalog(self):
+        self.assertUsageError(self.evaluate('--catalog', self.write('c.json', [{'name': 'A'}])),
+                'must be a JSON object')
+        self.assertUsageError(self.evaluate('--catalog', self.write('c.json', {'disks': [{'capacity': 1}]})),
+                'needs a "name"')
+
+    def test_bad_inventory(self):
+        self.assertUsageError(['fleet', self.write('f.json', {'disks': [{'capacity': 1}], 'pools': {}})],
+                'needs a "name"')
+
+    def test_good_input(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            cli.main(self.evaluate('--constraints', self.write('c.json', {'mission_length': '5'})))
+        self.assertEqual(json.loads(stdout.getvalue())['tco'], 200 + 24 * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+'''
+    Purpose:
+        Check the mixed-model mirror search against brute force.
+
+    Every set partition of a small disk list is an arrangement of mirrors. Arrangements
+    that differ only in mirror or member order, or in which of several identical disks
+    goes where, are the same pool; the search must yield each pool exactly once.
+
+    Run with: python -m unittest discover tests
+'''
+
+import unittest
+
+import com.heresjono.raidcalc as raidcalc
+
+A = raidcalc.HDD('A', 4e12, cost=170)
+B = raidcalc.HDD('B', 8e12, cost=305)
+C = raidcalc.SSD('C', 1e12, cost=190)
+
+
+def _set_partitions(
+        items:list      # Items to partition.
+        ):
+    '''Generate every partition of items into non-empty lists.'''
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for partition in _set_partitions(rest):
+        yield [[first]] + partition
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+
+
+def _key(
+        mirrors:list    # List of lists of Disks.
+        ):
+    '''Return a key that is the same for all orderings of mirrors and their members.'''
+    return tuple(sorted([tuple(sorted([disk.name for disk in mirror])) for mirror in mirrors]))
+
+
+class TestMixedConfigurations(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        raidcalc.MISSION_LENGTH = 3
+
+    def tearDown(self):
+        if self.mission_length is None:
+            del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+    def assertMatchesBruteForce(self, disks, max_width, max_afr, min_capacity=0):
+        want = set()
+        for partition in _set_partitions(disks):
+            if max([len(mirror) for mirror in partition]) > max_width:
+                continue
+            ary = raidcalc.DiskArray([raidcalc.Mirror(mirror) for mirror in partition])
+            if ary.annual_failure <= max_afr and ary.capacity >= min_capacity:
+                want.add(_key(partition))
+
+        got = [_key([mirror.devices for mirror in ary.devices]) for ary in
+            raidcalc._generate_mixed_configurations(disks, 0, 0, min_capacity, max_afr, max_width)]
+        self.assertEqual(len(got), len(set(got)), 'arrangement generated more than once')
+        self.assertEqual(set(got), want)
+
+    def test_unconstrained(self):
+        self.assertMatchesBruteForce([A] * 3 + [B] * 2 + [C], 6, 1)
+
+    def test_max_width(self):
+        self.assertMatchesBruteForce([A] * 3 + [B] * 3, 2, 1)
+
+    def test_max_afr(self):
+        self.assertMatchesBruteForce([A, B, C, A, B], 3, 1e-3)
+        self.assertMatchesBruteForce([A] * 2 + [B] * 2 + [C] * 3, 3, 2e-4)
+
+    def test_min_capacity(self):
+        self.assertMatchesBruteForce([A] * 3 + [B] * 3, 3, 1, min_capacity=12e12)
+
+    def test_unreachable_afr(self):
+        self.assertMatchesBruteForce([A] * 2 + [B], 3, 1e-12)
+
+    def test_same_as_homogeneous_search(self):
+        disks = [A] * 5 + [B] * 4
+        mixed = [_key([mirror.devices for mirror in ary.devices]) for ary in
+            raidcalc._generate_mixed_configurations(disks, 0, 0, 0, 1)]
+        homogeneous = [_key([mirror.devices for mirror in ary.devices]) for ary in
+            raidcalc._generate_disk_configurations(disks, 0, 0, 0, 1)]
+        self.assertTrue(set(homogeneous) <= set(mixed))
+
+
+if __name__ == '__main__':
+    unittest.main()
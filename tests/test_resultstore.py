@@ -0,0 +1,127 @@
+'''
+    Purpose:
+        Check result store writing and queries.
+'''
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import com.heresjono.raidcalc as raidcalc
+import com.heresjono.resultstore as resultstore
+
+A = raidcalc.HDD('A', 4e12, cost=170)
+B = raidcalc.HDD('B', 8e12, afr=0.06, cost=305)
+C = raidcalc.SSD('C', 1e12, cost=190)
+
+
+class StoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        raidcalc.MISSION_LENGTH = 3
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'store')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        if self.mission_length is None:
+            del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+
+class TestWriter(StoreTestCase):
+
+    def test_failed_write_keeps_previous_store(self):
+        resultstore.save_results(self.path, [raidcalc.DiskArray([raidcalc.Mirror([A, A])])])
+        big = raidcalc.DiskArray([raidcalc.Mirror([A, A]), raidcalc.Mirror([B, B, B])])
+
+        with self.assertRaises(ValueError):
+            with resultstore.ResultStoreWriter(self.path, 2) as writer:
+                writer.add(big)
+
+        with resultstore.ResultStore(self.path) as store:
+            self.assertEqual(len(store), 1)
+            self.assertEqual(repr(store.config(0)), repr(raidcalc.DiskArray([raidcalc.Mirror([A, A])])))
+        self.assertEqual(os.listdir(self.dir), ['store'])
+
+    def test_overwrite_replaces_store(self):
+        resultstore.save_results(self.path, [raidcalc.DiskArray([raidcalc.Mirror([A, A])])])
+        resultstore.save_results(self.path, [raidcalc.DiskArray([raidcalc.Mirror([B, B])])] * 3)
+        with resultstore.ResultStore(self.path) as store:
+            self.assertEqual(len(store), 3)
+            self.assertEqual(repr(store.config(2)), repr(raidcalc.DiskArray([raidcalc.Mirror([B, B])])))
+        self.assertEqual(os.listdir(self.dir), ['store'])
+
+    def test_refuses_unrelated_directory(self):
+        os.mkdir(self.path)
+        open(os.path.join(self.path, 'notes.txt'), 'w').close()
+        with self.assertRaises(ValueError):
+            resultstore.save_results(self.path, [raidcalc.DiskArray([raidcalc.Mirror([A, A])])])
+        self.assertEqual(os.listdir(self.path), ['notes.txt'])
+
+
+class TestQuery(StoreTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Small chunks force several sorted runs per index and a multi-way merge.
+        self.chunk_rows = resultstore.CHUNK_ROWS
+        resultstore.CHUNK_ROWS = 16
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.configs = raidcalc.generate_disk_configurations([A, B, C], min_capacity=0,
+                    max_afr=1, max_cost=1200)
+        resultstore.save_results(self.path, self.configs)
+        self.store = resultstore.ResultStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        resultstore.CHUNK_ROWS = self.chunk_rows
+        super().tearDown()
+
+    def brute_force(self, where, order_by, descending, limit):
+        rows = [row for row, config in enumerate(self.configs)
+            if all([(low is None or getattr(config, metric) >= low) and
+                (high is None or getattr(config, metric) <= high)
+                for metric, (low, high) in where.items()])]
+        if order_by:
+            rows.sort(key=lambda row: (getattr(self.configs[row], order_by), row), reverse=descending)
+        return rows if limit is None else rows[:limit]
+
+    def test_indexes_are_sorted(self):
+        self.assertGreater(len(self.store), 4 * resultstore.CHUNK_ROWS)
+        for metric in resultstore.METRICS:
+            column = self.store.column(metric)
+            index = self.store._indexes[metric]
+            self.assertEqual(list(index), sorted(range(len(self.store)), key=lambda row: (column[row], row)))
+
+    def test_queries_match_brute_force(self):
+        queries = [
+            ({}, None, False, None),
+            ({}, 'cost', False, 5),
+            ({'capacity': (6e12, None)}, 'tco', True, 5),
+            ({'capacity': (6e12, None), 'annual_failure': (None, 1e-3)}, 'cost', False, None),
+            ({'capacity': (6e12, None), 'annual_failure': (None, 1e-3)}, 'cost', False, 3),
+            ({'cost': (300, 700)}, None, False, None),
+            ({'cost': (340, 340)}, 'capacity', True, None),
+            ({'read_throughput': (None, 0)}, None, False, None),
+            ({'capacity': (8e12, 16e12), 'cost': (None, 900)}, 'annual_failure', False, 1),
+            ({'capacity': (8e12, 16e12)}, 'cost', True, 0),
+            ]
+        for where, order_by, descending, limit in queries:
+            with self.subTest(where=where, order_by=order_by, descending=descending, limit=limit):
+                rows = self.store.query(where, order_by, descending, limit)
+                self.assertEqual(rows, self.brute_force(where, order_by, descending, limit))
+
+    def test_configs_round_trip(self):
+        for row in range(0, len(self.store), 7):
+            self.assertEqual(repr(self.store.config(row)), repr(self.configs[row]))
+            self.assertEqual(self.store.value('tco', row), self.configs[row].tco)
+
+
+if __name__ == '__main__':
+    unittest.main()
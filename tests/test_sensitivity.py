@@ -0,0 +1,70 @@
+'''
+    Purpose:
+        Check that sensitivity scenarios are evaluated with raidcalc's own model.
+'''
+
+import unittest
+
+import com.heresjono.raidcalc as raidcalc
+import com.heresjono.sensitivity as sensitivity
+
+
+class SlowHDD(raidcalc.HDD):
+    '''HDD whose failure rate is a quarter of its nominal AFR, as a model override.'''
+
+    @property
+    def annual_failure(self):
+        return self._afr / 4
+
+
+A = raidcalc.HDD('A', 4e12, afr=0.05, cost=170, replacement_time=48)
+B = raidcalc.HDD('B', 8e12, speed=180e6, afr=0.03, cost=305)
+C = SlowHDD('C', 8e12, afr=0.08, cost=250)
+D = raidcalc.SSD('D', 1e12, cost=190)
+
+
+class TestEvaluate(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        raidcalc.MISSION_LENGTH = 3
+
+    def tearDown(self):
+        if self.mission_length is None:
+            del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+    def configs(self):
+        return [
+            raidcalc.DiskArray([raidcalc.Mirror([A, B]), raidcalc.Mirror([B] * 3)]),
+            raidcalc.DiskArray([raidcalc.Mirror([C, C]), raidcalc.Mirror([A, C]), D]),
+            raidcalc.DiskArray([raidcalc.DiskArray([raidcalc.Mirror([A, A]), B]), raidcalc.Mirror([D, D])]),
+            ]
+
+    def test_nominal_matches_model(self):
+        for config in self.configs():
+            results = sensitivity._evaluate(config, {}, 1)
+            for metric in sensitivity.METRICS:
+                self.assertEqual(results[metric], [getattr(config, metric)])
+
+    def test_scenarios_match_rebuilt_model(self):
+        config = self.configs()[1]
+        columns = {(C, 'afr'): [0.08, 0.16], (A, 'speed'): [100e6, 50e6], (D, 'cost'): [190, 95]}
+        results = sensitivity._evaluate(config, columns, 2)
+
+        slow_c = SlowHDD('C', 8e12, afr=0.16, cost=250)
+        slow_a = raidcalc.HDD('A', 4e12, speed=50e6, afr=0.05, cost=170, replacement_time=48)
+        cheap_d = raidcalc.SSD('D', 1e12, cost=95)
+        perturbed = raidcalc.DiskArray([raidcalc.Mirror([slow_c, slow_c]),
+            raidcalc.Mirror([slow_a, slow_c]), cheap_d])
+        for metric in sensitivity.METRICS:
+            self.assertEqual(results[metric], [getattr(config, metric), getattr(perturbed, metric)])
+
+    def test_sample_metrics_needs_two_draws(self):
+        with self.assertRaises(ValueError):
+            sensitivity.sample_metrics(self.configs()[0], {'afr': 0.5}, draws=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+'''
+    Purpose:
+        Check the upgrade planner.
+'''
+
+import contextlib
+import io
+import itertools
+import unittest
+
+import com.heresjono.raidcalc as raidcalc
+
+A = raidcalc.HDD('A', 4e12, cost=100)
+B = raidcalc.HDD('B', 8e12, afr=0.06, cost=200)
+
+
+class UpgradeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mission_length = getattr(raidcalc, 'MISSION_LENGTH', None)
+        raidcalc.MISSION_LENGTH = 3
+
+    def tearDown(self):
+        if self.mission_length is None:
+            del raidcalc.MISSION_LENGTH
+        else:
+            raidcalc.MISSION_LENGTH = self.mission_length
+
+    def generate_upgrades(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return raidcalc.generate_upgrades(*args, **kwargs)
+
+
+class TestPoolShapes(UpgradeTestCase):
+
+    def test_bare_disk_is_a_one_disk_mirror(self):
+        pool = raidcalc.DiskArray([raidcalc.Mirror([A, A]), B])
+        upgrades = self.generate_upgrades(pool, [B], max_afr=1, max_cost=200)
+        pools = [repr(upgrade.pool) for upgrade in upgrades]
+        self.assertIn(repr(raidcalc.DiskArray([raidcalc.Mirror([A, A]), raidcalc.Mirror([B, B])])), pools)
+        self.assertIn(repr(pool), pools)
+
+    def test_nested_stripe_is_rejected(self):
+        pool = raidcalc.DiskArray([raidcalc.DiskArray([A, A])])
+        with self.assertRaises(ValueError):
+            self.generate_upgrades(pool, [A])
+
+
+class TestReplacement(UpgradeTestCase):
+
+    def test_replacing_smallest_member_adds_capacity(self):
+        pool = raidcalc.DiskArray([raidcalc.Mirror([A, B])])
+        upgrades = self.generate_upgrades(pool, [A, B], max_afr=1, max_cost=200,
+                min_capacity=pool.capacity + 1)
+        # Only plans that add no mirror, which can raise capacity on their own.
+        upgrades = [upgrade for upgrade in upgrades if len(upgrade.pool.devices) == 1]
+        self.assertEqual([repr(upgrade.pool) for upgrade in upgrades],
+                [repr(raidcalc.DiskArray([raidcalc.Mirror([B, B])]))])
+        self.assertEqual(upgrades[0].cost, B.cost)
+
+    def test_replacement_tco_counts_only_bought_disks(self):
+        pool = raidcalc.DiskArray([raidcalc.Mirror([A, B])])
+        upgrade = raidcalc.Upgrade(pool, [([A], [B])], [])
+        self.assertEqual(upgrade.cost, B.cost)
+        self.assertAlmostEqual(upgrade.tco,
+                B.cost + (upgrade.pool.annual_cost - pool.annual_cost) * raidcalc.MISSION_LENGTH)
+
+    def test_never_replaces_with_smaller_or_equal_disks(self):
+        pool = raidcalc.DiskArray([raidcalc.Mirror([B, B])])
+        for upgrade in self.generate_upgrades(pool, [A, B], max_afr=1, max_cost=1000):
+            self.assertNotIn('Replace', repr(upgrade))
+
+
+def _plan_key(
+        mirrors:list,   # Existing Mirrors and bare Disks.
+        changes:list,   # (Disks removed, Disks bought) per mirror.
+        added:list=()   # New Mirrors.
+        ):
+    '''Return a key that is the same for plans differing only in which of several
+       identical mirrors each change goes to.'''
+    names = lambda disks: tuple([disk.name for disk in disks])
+    return (tuple(sorted([(repr(mirror), names(removed), names(bought))
+                for mirror, (removed, bought) in zip(mirrors, changes)])),
+            tuple(sorted([repr(mirror) for mirror in added])))
+
+
+class TestSearch(UpgradeTestCase):
+
+    def assertMatchesBruteForce(self, mirrors, options, max_cost, max_width):
+        # Every combination of each mirror's own choices, without symmetry breaking.
+        choices = [[(cost, change[0]) for cost, change in
+            raidcalc._generate_mirror_changes([mirror], options, float('inf'), max_width)]
+            for mirror in mirrors]
+        want = set()
+        for combination in itertools.product(*choices):
+            if sum([cost for cost, _ in combination]) <= max_cost:
+                want.add(_plan_key(mirrors, [change for _, change in combination]))
+
+        got = [_plan_key(mirrors, changes) for cost, changes in
+            raidcalc._generate_mirror_changes(mirrors, options, max_cost, max_width)]
+        self.assertEqual(len(got), len(set(got)), 'plan generated more than once')
+        self.assertEqual(set(got), want)
+
+    def test_identical_mirrors(self):
+        mirror = raidcalc.Mirror([A, A])
+        self.assertMatchesBruteForce([mirror, mirror, mirror], [A, B], 600, 3)
+
+    def test_equal_but_distinct_mirrors(self):
+        self.assertMatchesBruteForce([raidcalc.Mirror([A, A]), raidcalc.Mirror([A, A]), A],
+                [A, B], 500, 3)
+
+    def test_mixed_mirrors(self):
+        self.assertMatchesBruteForce([raidcalc.Mirror([A, B]), raidcalc.Mirror([B, B]),
+                raidcalc.Mirror([A, B])], [A, B], 800, 4)
+
+    def test_no_budget(self):
+        self.assertMatchesBruteForce([raidcalc.Mirror([A, B])], [A, B], 0, 3)
+
+    def test_upgrades_within_budget_and_unique(self):
+        mirror = raidcalc.Mirror([A, A])
+        pool = raidcalc.DiskArray([mirror, mirror, raidcalc.Mirror([A, B])])
+        for max_cost in (0, 250, 700):
+            upgrades = self.generate_upgrades(pool, [A, B], max_afr=1, max_cost=max_cost)
+            keys = [_plan_key(pool.devices, upgrade._changes, upgrade._added) for upgrade in upgrades]
+            self.assertEqual(len(keys), len(set(keys)))
+            self.assertTrue(all([upgrade.cost <= max_cost for upgrade in upgrades]))
+            self.assertEqual(len(upgrades) == 1, max_cost < A.cost)
+
+
+if __name__ == '__main__':
+    unittest.main()